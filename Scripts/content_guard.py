@@ -10,27 +10,283 @@ Lightweight, offline heuristics to audit AI-assisted text for:
 
 Usage:
   python content_guard.py path/to/file.txt
+  python content_guard.py Guides/*.md Academic/README.md
+  python content_guard.py --no-cache path/to/file.txt
   echo "text" | python content_guard.py
+  python content_guard.py serve --port 8765
 
 Outputs a JSON report with recommendations aligned to the repo's integrity focus.
+When several files are given, the output maps each path to its report.
+
+Markdown files (.md, .markdown, or --format markdown) are pre-tokenized so that
+front matter, fenced code, tables and headings are not scored as prose. Their
+reports add a "structure" summary and per-section scores keyed by heading.
+
+Reports for files are cached on disk (default: .content_guard_cache, or
+$CONTENT_GUARD_CACHE_DIR) keyed by a hash of the content and ANALYZER_VERSION,
+so unchanged documents are not re-analyzed. The cache is size-capped and evicts
+least recently used entries first. With --incremental, per-paragraph metric
+partials are cached per file as well, so after an edit only the changed
+paragraphs are re-analyzed and the totals are recombined.
+
+`serve` starts a long-running local HTTP daemon (TCP on 127.0.0.1, or a Unix
+socket with --socket) that keeps compiled patterns and the cache warm:
+  POST /audit   raw text, or JSON {"text", "format", "path", "spans"}
+  GET  /stats   request count, errors and latency percentiles
+  GET  /health  liveness and analyzer version
 """
 
 import sys
+import os
 import json
 import re
-from collections import Counter
+import hashlib
+import argparse
+import threading
+import time
+import socketserver
+import stat
+import tempfile
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+# Bump whenever the analysis or report layout changes so cached reports are not reused.
+ANALYZER_VERSION = "3"
+
+DEFAULT_CACHE_DIR = os.environ.get("CONTENT_GUARD_CACHE_DIR", ".content_guard_cache")
+DEFAULT_CACHE_MAX_MB = 64
+
+
+class ResultCache:
+    """On-disk, content-addressed report cache with LRU eviction.
+
+    Each entry is one JSON file named after its key. File mtimes record the last
+    access, so eviction removes the least recently used entries until the cache
+    fits within max_bytes. The total size is scanned once and then kept as a
+    running estimate, so puts only rescan the directory when eviction is due;
+    eviction goes down to EVICT_TO of max_bytes so it is not due again at once.
+    Write failures (read-only or full disk) leave the cache unchanged; callers
+    still get their report.
+    """
+
+    EVICT_TO = 0.9
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_CACHE_MAX_MB * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.total_bytes = None  # scanned on the first put
+        self.write_warned = False
+        self.lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key_for(text: str, mode: str = "") -> str:
+        digest = hashlib.sha256()
+        digest.update(f"{ANALYZER_VERSION}\0{mode}\0".encode("utf-8"))
+        digest.update(text.encode("utf-8", errors="surrogatepass"))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + ".json")
+
+    def get(self, key: str):
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = json.load(f)
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(path)  # mark as recently used
+        except OSError:
+            pass
+        return value
+
+    def put(self, key: str, value) -> None:
+        path = self._path(key)
+        tmp_path = None
+        try:
+            try:
+                replaced = os.stat(path).st_size
+            except OSError:
+                replaced = 0
+            # A unique temp file per write: serve threads may store the same key at once
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(value, f, ensure_ascii=False)
+            size = os.stat(tmp_path).st_size
+            os.replace(tmp_path, path)
+        except OSError as e:
+            if tmp_path is not None:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+            if not self.write_warned:
+                self.write_warned = True
+                print(f"content_guard: cache write failed, continuing uncached: {e}", file=sys.stderr)
+            return
+        with self.lock:
+            if self.total_bytes is None:
+                self.total_bytes = self.scan()[1]
+            else:
+                self.total_bytes += size - replaced
+            due = self.total_bytes > self.max_bytes
+        if due:
+            self.evict()
+
+    def scan(self):
+        """Return ([(mtime, size, path)], total_bytes) for the cached entries."""
+        entries = []
+        total = 0
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if not entry.name.endswith(".json"):
+                        continue
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+                    total += st.st_size
+        except OSError:
+            pass
+        return entries, total
+
+    def evict(self) -> None:
+        with self.lock:
+            entries, total = self.scan()
+            if total > self.max_bytes:
+                target = self.max_bytes * self.EVICT_TO
+                entries.sort()
+                for _, size, path in entries:
+                    if total <= target:
+                        break
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        continue
+                    total -= size
+            self.total_bytes = total
 
 
-def read_input():
+def read_input(paths=None):
+    if paths:
+        with open(paths[0], 'r', encoding='utf-8', errors='replace') as f:
+            return f.read()
     if not sys.stdin.isatty():
         return sys.stdin.read()
-    if len(sys.argv) > 1:
-        with open(sys.argv[1], 'r', encoding='utf-8', errors='replace') as f:
-            return f.read()
     print("Provide text via file path or STDIN", file=sys.stderr)
     sys.exit(1)
 
 
+MARKDOWN_SUFFIXES = ('.md', '.markdown')
+
+_MD_HEADING = re.compile(r" {0,3}(#{1,6})(?:\s+(.*?))?\s*#*\s*$")
+_MD_FENCE = re.compile(r" {0,3}(`{3,}|~{3,})")
+_MD_LIST_ITEM = re.compile(r"\s*(?:[-*+]|\d+[.)])\s+")
+_MD_RULE = re.compile(r" {0,3}(?:(?:-\s*){3,}|(?:\*\s*){3,}|(?:_\s*){3,})$")
+
+
+def markdown_blocks(text: str):
+    """Split Markdown into classified blocks with a single linear pass over lines.
+
+    Returns (blocks, sections) where blocks is a list of (kind, section_index, text)
+    with kind one of "prose", "code", "table" or "front_matter", and sections is a
+    list of {"heading", "level"} dicts; index 0 is the untitled preamble.
+    """
+    lines = text.splitlines()
+    blocks = []
+    sections = [{"heading": "", "level": 0}]
+    section = 0
+    paragraph = []
+    table = []
+
+    def flush_paragraph():
+        if paragraph:
+            blocks.append(("prose", section, " ".join(paragraph)))
+            paragraph.clear()
+
+    def flush_table():
+        if table:
+            blocks.append(("table", section, "\n".join(table)))
+            table.clear()
+
+    i = 0
+    n = len(lines)
+    if n and lines[0].strip() == "---":
+        for j in range(1, n):
+            if lines[j].strip() in ("---", "..."):
+                blocks.append(("front_matter", 0, "\n".join(lines[1:j])))
+                i = j + 1
+                break
+
+    while i < n:
+        line = lines[i]
+        stripped = line.strip()
+
+        fence = _MD_FENCE.match(line)
+        if fence:
+            flush_paragraph()
+            flush_table()
+            marker = fence.group(1)
+            start = i + 1
+            i = start
+            # Guides often nest ```lang blocks inside a bare ``` template block;
+            # count those as nested so the outer block closes where intended.
+            depth = 1
+            while i < n:
+                inner = lines[i].strip()
+                if inner.startswith(marker):
+                    if inner.strip(marker[0]):
+                        depth += 1
+                    else:
+                        depth -= 1
+                        if depth == 0:
+                            break
+                i += 1
+            blocks.append(("code", section, "\n".join(lines[start:i])))
+            i += 1
+            continue
+
+        if stripped.startswith("|"):
+            flush_paragraph()
+            table.append(line)
+            i += 1
+            continue
+        flush_table()
+
+        if not stripped or _MD_RULE.match(line):
+            flush_paragraph()
+            i += 1
+            continue
+
+        heading = _MD_HEADING.match(line)
+        if heading:
+            flush_paragraph()
+            sections.append({"heading": heading.group(2) or "", "level": len(heading.group(1))})
+            section = len(sections) - 1
+            i += 1
+            continue
+
+        while stripped.startswith(">"):
+            stripped = stripped[1:].lstrip()
+        item = _MD_LIST_ITEM.match(stripped)
+        if item:
+            flush_paragraph()
+            stripped = stripped[item.end():]
+        if stripped:
+            paragraph.append(stripped)
+        i += 1
+
+    flush_paragraph()
+    flush_table()
+    return blocks, sections
+
+
 def sentence_split(text: str):
     # Simple splitter; not language-aware
     return re.split(r"(?<=[.!?])\s+", text.strip())
@@ -40,54 +296,77 @@ def token_count(text: str):
     return len(re.findall(r"\w+", text))
 
 
-def estimate_readability(sentences):
+def estimate_readability(words: int, sents: int):
     # Flesch-like very rough proxy
-    words = sum(len(re.findall(r"\w+", s)) for s in sentences) or 1
-    sents = max(len(sentences), 1)
-    avg_sentence_len = words / sents
+    avg_sentence_len = (words or 1) / max(sents, 1)
     score = max(0, min(100, 100 - (avg_sentence_len - 15) * 5))
     return round(score, 1)
 
 
-def variability(sentences):
-    lengths = [len(re.findall(r"\w+", s)) for s in sentences if s.strip()]
-    if not lengths:
+def variability(n: int, total: int, squares: int):
+    # Variance of sentence lengths from their count, sum and sum of squares
+    if not n:
         return 0.0
-    mean = sum(lengths) / len(lengths)
-    var = sum((l - mean) ** 2 for l in lengths) / len(lengths)
+    mean = total / n
+    var = (n * squares - total * total) / (n * n)
     # normalize to 0..1 rough
     return round(min(1.0, var / (mean ** 2 + 1e-6)), 3)
 
 
-def citation_near_claims(sentences):
-    # Detect numbers/named entities heuristically and see if citation-like patterns exist
-    citation_patterns = [r"\[(?:S\d+|\d+)\]", r"\(.*\d{4}.*\)", r"doi:\s*10\.\S+", r"https?://\S+"]
-    claim_like = []
-    for i, s in enumerate(sentences):
-        has_number = bool(re.search(r"\d", s))
-        has_capitalized_sequence = bool(re.search(r"(?:[A-Z][a-z]+\s){2,}", s))
-        if has_number or has_capitalized_sequence:
-            claim_like.append((i, s))
+# All citation forms in one alternation so each sentence is scanned once. The
+# author-year form only matches inside a single (...) pair and checks for the year
+# with a lookahead, which keeps matching linear even on long unbalanced lines.
+CITATION_PATTERN = re.compile(
+    r"(?P<bracket>\[(?:S\d+|\d+)\])"
+    r"|(?P<author_year>\((?=[^()]*\d{4})[^()]*\))"
+    r"|(?P<doi>doi:\s*10\.\S+)"
+    r"|(?P<url>https?://\S+)"
+)
+_CLAIM_NUMBER = re.compile(r"\d")
+_CLAIM_NAMES = re.compile(r"(?:[A-Z][a-z]+\s){2,}")
+
+
+def find_citations(text: str):
+    """Return (start, end, kind) for each citation-like span in text."""
+    return [(m.start(), m.end(), m.lastgroup) for m in CITATION_PATTERN.finditer(text)]
+
+
+def is_claim_like(sentence: str) -> bool:
+    # Numbers or runs of capitalized words are a cheap proxy for factual claims
+    return bool(_CLAIM_NUMBER.search(sentence) or _CLAIM_NAMES.search(sentence))
+
+
+def citation_near_claims(sentences, include_spans: bool = False):
+    claim_like = 0
     cited = 0
-    for _, s in claim_like:
-        if any(re.search(p, s) for p in citation_patterns):
+    mapping = []
+    for i, s in enumerate(sentences):
+        if not is_claim_like(s):
+            continue
+        claim_like += 1
+        if include_spans:
+            spans = find_citations(s)
+            if spans:
+                mapping.append({
+                    "sentence": i,
+                    "spans": [{"start": a, "end": b, "kind": kind, "text": s[a:b]} for a, b, kind in spans]
+                })
+        else:
+            spans = CITATION_PATTERN.search(s)
+        if spans:
             cited += 1
-    coverage = round(cited / len(claim_like), 3) if claim_like else 1.0
-    return {
-        "claim_like_sentences": len(claim_like),
+    coverage = round(cited / claim_like, 3) if claim_like else 1.0
+    result = {
+        "claim_like_sentences": claim_like,
         "with_citation_pattern": cited,
         "coverage_ratio": coverage
     }
+    if include_spans:
+        result["citations"] = mapping
+    return result
 
 
-def plagiarism_risk_signals(text, sentences):
-    quote_ratio = len(re.findall(r"\"[^\"]+\"|'[^']+'", text)) / max(len(sentences), 1)
-    repeats = Counter([s.strip().lower() for s in sentences if s.strip()])
-    repetition_ratio = max(repeats.values()) / max(len(sentences), 1)
-    return {
-        "quote_per_sentence": round(quote_ratio, 3),
-        "max_sentence_repetition_ratio": round(repetition_ratio, 3)
-    }
+_QUOTE = re.compile(r"\"[^\"]+\"|'[^']+'")
 
 
 def disclosure_present(text):
@@ -95,24 +374,159 @@ def disclosure_present(text):
     return any(re.search(p, text, re.IGNORECASE) for p in patterns)
 
 
-def main():
-    text = read_input()
-    sentences = sentence_split(text)
+# Text-mode paragraphs end at a blank line that follows sentence punctuation, i.e.
+# only where sentence_split() would split anyway, so sentences never straddle two.
+_PARAGRAPH_BREAK = re.compile(r"(?<=[.!?])\s*\n\s*\n\s*")
+
+
+def document_blocks(text: str, fmt: str = "text"):
+    """Return (prose, headings, structure) for a document.
+
+    prose is a list of (section_index, paragraph) pairs. headings and structure
+    are None in text mode.
+    """
+    if fmt != "markdown":
+        stripped = text.strip()
+        return [(0, block) for block in _PARAGRAPH_BREAK.split(stripped)] if stripped else [], None, None
+
+    blocks, headings = markdown_blocks(text)
+    prose = [(idx, block) for kind, idx, block in blocks if kind == "prose"]
+    structure = {
+        "sections": len(headings) - 1,
+        "prose_blocks": len(prose),
+        "code_blocks": sum(1 for kind, _, _ in blocks if kind == "code"),
+        "code_lines": sum(block.count("\n") + 1 for kind, _, block in blocks if kind == "code" and block),
+        "tables": sum(1 for kind, _, _ in blocks if kind == "table"),
+        "front_matter": any(kind == "front_matter" for kind, _, _ in blocks)
+    }
+    return prose, headings, structure
+
+
+def paragraph_partial(block: str, spans: bool = False):
+    """Additive metric partials for one paragraph; merge them with combine_partials()."""
+    sentences = sentence_split(block)
+    lengths = [token_count(s) for s in sentences if s.strip()]
+    citations = citation_near_claims(sentences, spans)
+    partial = {
+        "sentences": len(sentences),
+        "tokens": token_count(block),
+        "lengths": [len(lengths), sum(lengths), sum(l * l for l in lengths)],
+        "claims": citations["claim_like_sentences"],
+        "cited": citations["with_citation_pattern"],
+        "quotes": len(_QUOTE.findall(block)),
+        "repeats": dict(Counter(s.strip().lower() for s in sentences if s.strip())),
+        "disclosure": disclosure_present(block)
+    }
+    if spans:
+        partial["citations"] = citations["citations"]
+    return partial
+
+
+def combine_partials(parts, spans: bool = False):
+    total = {
+        "sentences": 0,
+        "tokens": 0,
+        "lengths": [0, 0, 0],
+        "claims": 0,
+        "cited": 0,
+        "quotes": 0,
+        "repeats": Counter(),
+        "disclosure": False
+    }
+    if spans:
+        total["citations"] = []
+    for part in parts:
+        if spans:
+            offset = total["sentences"]
+            total["citations"].extend(dict(c, sentence=c["sentence"] + offset) for c in part["citations"])
+        for field in ("sentences", "tokens", "claims", "cited", "quotes"):
+            total[field] += part[field]
+        total["lengths"] = [x + y for x, y in zip(total["lengths"], part["lengths"])]
+        total["repeats"].update(part["repeats"])
+        total["disclosure"] = total["disclosure"] or part["disclosure"]
+    return total
+
+
+def coverage_ratio(total):
+    return round(total["cited"] / total["claims"], 3) if total["claims"] else 1.0
+
+
+def section_scores(total):
+    return {
+        "sentences": total["sentences"],
+        "tokens": total["tokens"],
+        "readability": estimate_readability(total["tokens"], total["sentences"]),
+        "sentence_variability": variability(*total["lengths"]),
+        "citation_coverage_ratio": coverage_ratio(total)
+    }
+
+
+def block_key(block: str) -> str:
+    return hashlib.sha1(block.encode("utf-8", errors="surrogatepass")).hexdigest()
+
+
+def analyze(text: str, fmt: str = "text", spans: bool = False, partials=None):
+    """Build the audit report for text.
+
+    partials optionally maps paragraph hashes to partials from an earlier run;
+    only paragraphs missing from it are analyzed. It is updated in place to hold
+    exactly the partials of this text, ready to be stored for the next run.
+    """
+    prose, headings, structure = document_blocks(text, fmt)
+
+    parts = []
+    current = {}
+    for idx, block in prose:
+        key = block_key(block)
+        part = current.get(key)
+        if part is None and partials is not None:
+            part = partials.get(key)
+        if part is None:
+            part = paragraph_partial(block, spans)
+        current[key] = part
+        parts.append((idx, part))
+    if partials is not None:
+        partials.clear()
+        partials.update(current)
+
+    total = combine_partials((part for _, part in parts), spans)
+    sentences = total["sentences"]
+
+    citation_audit = {
+        "claim_like_sentences": total["claims"],
+        "with_citation_pattern": total["cited"],
+        "coverage_ratio": coverage_ratio(total)
+    }
+    if spans:
+        citation_audit["citations"] = total["citations"]
 
     report = {
         "stats": {
-            "sentences": len(sentences),
-            "tokens": token_count(text)
+            "sentences": sentences,
+            "tokens": total["tokens"]
         },
         "style_audit": {
-            "readability": estimate_readability(sentences),
-            "sentence_variability": variability(sentences)
+            "readability": estimate_readability(total["tokens"], sentences),
+            "sentence_variability": variability(*total["lengths"])
+        },
+        "citation_audit": citation_audit,
+        "plagiarism_risk_signals": {
+            "quote_per_sentence": round(total["quotes"] / max(sentences, 1), 3),
+            "max_sentence_repetition_ratio": round(max(total["repeats"].values(), default=0) / max(sentences, 1), 3)
         },
-        "citation_audit": citation_near_claims(sentences),
-        "plagiarism_risk_signals": plagiarism_risk_signals(text, sentences),
-        "ai_use_disclosure_present": disclosure_present(text),
+        "ai_use_disclosure_present": total["disclosure"],
         "recommendations": []
     }
+    if structure is not None:
+        by_section = {}
+        for idx, part in parts:
+            by_section.setdefault(idx, []).append(part)
+        report["structure"] = structure
+        report["sections"] = [
+            dict(heading=headings[idx]["heading"], level=headings[idx]["level"],
+                 **section_scores(combine_partials(by_section[idx])))
+            for idx in sorted(by_section)
+        ]
 
     if report["citation_audit"]["coverage_ratio"] < 0.6:
         report["recommendations"].append(
@@ -127,7 +541,291 @@ def main():
             "Improve clarity: shorten sentences and reduce jargon."
         )
 
-    print(json.dumps(report, ensure_ascii=False, indent=2))
+    return report
+
+
+def audit_text(text: str, cache=None, fmt: str = "text", spans: bool = False,
+               path=None, incremental: bool = False):
+    """Analyze text, reusing a cached report when the content is unchanged.
+
+    With incremental=True and a path, per-paragraph partials for that path are
+    kept in the cache too, so an edited document only re-analyzes the paragraphs
+    that changed.
+    """
+    if cache is None:
+        return analyze(text, fmt, spans)
+    mode = f"{fmt}+spans" if spans else fmt
+    key = ResultCache.key_for(text, mode)
+    report = cache.get(key)
+    if report is not None:
+        return report
+
+    partials = None
+    if incremental and path:
+        partials_key = ResultCache.key_for(os.path.abspath(path), f"partials:{mode}")
+        partials = cache.get(partials_key) or {}
+    report = analyze(text, fmt, spans, partials)
+    cache.put(key, report)
+    if partials is not None:
+        cache.put(partials_key, partials)
+    return report
+
+
+def resolve_format(path, fmt: str = "auto") -> str:
+    if fmt != "auto":
+        return fmt
+    if path and path.lower().endswith(MARKDOWN_SUFFIXES):
+        return "markdown"
+    return "text"
+
+
+class LatencyStats:
+    """Thread-safe request counters with latency percentiles over recent requests."""
+
+    def __init__(self, window: int = 4096):
+        self.samples = deque(maxlen=window)
+        self.requests = 0
+        self.errors = 0
+        self.started = time.time()
+        self.lock = threading.Lock()
+
+    def record(self, seconds: float, ok: bool = True) -> None:
+        with self.lock:
+            self.requests += 1
+            if not ok:
+                self.errors += 1
+            self.samples.append(seconds)
+
+    def snapshot(self):
+        with self.lock:
+            samples = sorted(self.samples)
+            requests, errors = self.requests, self.errors
+
+        def pct(p):
+            if not samples:
+                return 0.0
+            return round(samples[min(len(samples) - 1, int(p * len(samples)))] * 1000, 3)
+
+        return {
+            "requests": requests,
+            "errors": errors,
+            "uptime_s": round(time.time() - self.started, 1),
+            "latency_ms": {
+                "window": len(samples),
+                "mean": round(sum(samples) / len(samples) * 1000, 3) if samples else 0.0,
+                "p50": pct(0.50),
+                "p95": pct(0.95),
+                "p99": pct(0.99),
+                "max": round(samples[-1] * 1000, 3) if samples else 0.0
+            }
+        }
+
+
+class PooledServerMixIn:
+    """Serve each accepted connection on a fixed-size worker pool."""
+
+    workers = os.cpu_count() or 4
+    # socketserver's default listen backlog of 5 resets connections under bursts
+    request_queue_size = 128
+
+    def process_request(self, request, client_address):
+        if not hasattr(self, "pool"):
+            self.pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="content_guard")
+        self.pool.submit(self.process_request_worker, request, client_address)
+
+    def process_request_worker(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        if hasattr(self, "pool"):
+            self.pool.shutdown(wait=True)
+
+
+class AuditHTTPServer(PooledServerMixIn, HTTPServer):
+    pass
+
+
+if hasattr(socketserver, "UnixStreamServer"):
+    class UnixAuditServer(PooledServerMixIn, socketserver.UnixStreamServer):
+        pass
+
+
+class AuditRequestHandler(BaseHTTPRequestHandler):
+    """HTTP front end for audit_text(); state lives on the server object."""
+
+    server_version = f"content_guard/{ANALYZER_VERSION}"
+    protocol_version = "HTTP/1.1"
+    # Each connection holds a pool worker; drop idle keep-alive clients so they cannot hold them all
+    timeout = 30
+
+    def address_string(self):
+        # Unix socket peers have no (host, port) address
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def send_json(self, status: int, payload) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        route = urlsplit(self.path).path
+        if route == "/health":
+            self.send_json(200, {"status": "ok", "analyzer_version": ANALYZER_VERSION})
+        elif route == "/stats":
+            self.send_json(200, self.server.stats.snapshot())
+        else:
+            self.send_json(404, {"error": f"Unknown route: {route}"})
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        if url.path != "/audit":
+            self.send_json(404, {"error": f"Unknown route: {url.path}"})
+            return
+
+        start = time.perf_counter()
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            body = self.rfile.read(length).decode("utf-8", errors="replace")
+            options = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            if self.headers.get("Content-Type", "").startswith("application/json"):
+                payload = json.loads(body)
+                text = payload["text"]
+                if not isinstance(text, str):
+                    raise TypeError('"text" must be a string')
+                options.update({k: payload[k] for k in ("format", "path", "spans") if k in payload})
+            else:
+                text = body
+            fmt = resolve_format(options.get("path"), options.get("format", "auto"))
+            spans = options.get("spans") in (True, "1", "true")
+            report = audit_text(text, self.server.cache, fmt, spans,
+                                options.get("path"), self.server.incremental)
+        except (ValueError, KeyError, TypeError) as e:
+            self.server.stats.record(time.perf_counter() - start, ok=False)
+            self.send_json(400, {"error": f"Bad request: {e}"})
+            return
+        except Exception as e:
+            self.server.stats.record(time.perf_counter() - start, ok=False)
+            self.log_error("audit failed: %r", e)
+            self.send_json(500, {"error": f"Internal error: {type(e).__name__}: {e}"})
+            return
+        self.server.stats.record(time.perf_counter() - start)
+        self.send_json(200, report)
+
+
+def add_cache_arguments(parser) -> None:
+    parser.add_argument('--no-cache', action='store_true', help='Always re-analyze; do not read or write the cache')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help='Directory for cached reports')
+    parser.add_argument('--cache-max-mb', type=float, default=DEFAULT_CACHE_MAX_MB,
+                        help='Evict least recently used reports beyond this size')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Keep per-paragraph partials so edited files only re-analyze changed paragraphs')
+
+
+def cache_from_args(parser, args):
+    if args.no_cache and args.incremental:
+        parser.error("--incremental needs the cache; drop --no-cache")
+    if args.no_cache:
+        return None
+    try:
+        return ResultCache(args.cache_dir, int(args.cache_max_mb * 1024 * 1024))
+    except OSError as e:
+        if args.incremental:
+            parser.error(f"--incremental needs the cache, which is unavailable: {e}")
+        print(f"content_guard: cache unavailable, continuing uncached: {e}", file=sys.stderr)
+        return None
+
+
+def serve(argv):
+    parser = argparse.ArgumentParser(prog="content_guard.py serve",
+                                     description="Run content_guard as a long-lived local audit service")
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to bind (default: loopback only)')
+    parser.add_argument('--port', type=int, default=8765, help='TCP port to listen on')
+    parser.add_argument('--socket', help='Listen on this Unix socket path instead of TCP')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 4, help='Concurrent request workers')
+    parser.add_argument('--quiet', action='store_true', help='Do not log each request')
+    add_cache_arguments(parser)
+    args = parser.parse_args(argv)
+
+    if args.socket:
+        if not hasattr(socketserver, "UnixStreamServer"):
+            parser.error("--socket is not supported on this platform")
+        try:
+            st = os.stat(args.socket)
+        except FileNotFoundError:
+            st = None
+        except OSError as e:
+            parser.error(f"cannot use --socket {args.socket}: {e}")
+        if st is not None:
+            # Only clear a stale socket; never delete a file the path names by mistake
+            if not stat.S_ISSOCK(st.st_mode):
+                parser.error(f"--socket {args.socket} exists and is not a socket")
+            os.remove(args.socket)
+        server = UnixAuditServer(args.socket, AuditRequestHandler)
+        where = args.socket
+    else:
+        server = AuditHTTPServer((args.host, args.port), AuditRequestHandler)
+        where = f"http://{args.host}:{server.server_address[1]}"
+
+    server.workers = max(1, args.workers)
+    server.cache = cache_from_args(parser, args)
+    server.incremental = args.incremental
+    server.stats = LatencyStats()
+    server.quiet = args.quiet
+
+    print(f"content_guard {ANALYZER_VERSION} serving on {where} with {server.workers} workers", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if args.socket and os.path.exists(args.socket):
+            os.remove(args.socket)
+
+
+def main():
+    if sys.argv[1:2] == ['serve']:
+        serve(sys.argv[2:])
+        return
+
+    parser = argparse.ArgumentParser(description="Offline integrity heuristics for AI-assisted text")
+    parser.add_argument('paths', nargs='*', help='Files to audit (reads STDIN when omitted)')
+    add_cache_arguments(parser)
+    parser.add_argument('--format', choices=['auto', 'text', 'markdown'], default='auto',
+                        help='Input format; auto treats .md/.markdown files as Markdown')
+    parser.add_argument('--spans', action='store_true',
+                        help='List matched citation spans per claim-like sentence')
+    args = parser.parse_args()
+
+    if not args.paths:
+        # STDIN input is usually one-off; cache only what lives on disk.
+        report = analyze(read_input(), resolve_format(None, args.format), args.spans)
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return
+
+    cache = cache_from_args(parser, args)
+    reports = {}
+    for path in args.paths:
+        reports[path] = audit_text(read_input([path]), cache, resolve_format(path, args.format), args.spans,
+                                   path, args.incremental)
+
+    if len(args.paths) == 1:
+        print(json.dumps(reports[args.paths[0]], ensure_ascii=False, indent=2))
+    else:
+        print(json.dumps(reports, ensure_ascii=False, indent=2))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,687 @@
+#!/usr/bin/env python3
+"""
+Quickstart Pipeline Runner
+
+Runs the Examples/quickstarts chains (run_rag.sh, run_paper.sh, run_analysis.sh,
+run_kb.sh) as a DAG of stages on top of PromptAutomation:
+
+- Stages whose inputs are ready run concurrently (up to --jobs model calls at once)
+- Each stage is sent only the inputs its prompt references, not the full context
+- Stage outputs are cached on disk by a hash of the rendered prompt and model, so a
+  rerun skips every stage whose inputs are unchanged
+- JSON outputs are validated in-process against JSON-Schemas (the rubric evaluation
+  against prompt-eval-rubric.json, the analysis report against data-analysis-report.json);
+  an invalid output fails the stage and skips its dependents
+- --model stub answers every stage from a local, offline stub provider
+
+Usage:
+    python pipeline.py CHAIN [options]
+
+Chains:
+    rag       RAG answer -> rubric evaluation + research brief
+    paper     LaTeX paper skeleton -> Zotero TODO
+    analysis  analysis plan + report JSON -> Vega-Lite chart and viewer
+    kb        entity/relation extraction + source graph + update plan
+
+Options:
+    --model NAME        stub (default, offline), gpt-5, claude-4.1 or grok-4
+    --context FILE      rag/paper context (default: built-in sample)
+    --question FILE     rag question (default: built-in sample)
+    --topic TEXT        paper topic (required for paper)
+    --dataset FILE      analysis dataset description (default: built-in sample)
+    --sources FILE      kb sources (default: built-in sample)
+    --out-dir DIR       Directory for the stage output files (default: .)
+    --jobs N            Maximum concurrent model calls (default: 4)
+    --cache-dir DIR     Stage cache directory (default: .pipeline_cache, or
+                        $PIPELINE_CACHE_DIR)
+    --no-cache          Always re-run stages; do not read or write the cache
+    --schema-dir DIR    Directory containing JSON schemas (default: the repository's
+                        JSON-Schemas, resolved relative to this script)
+    --stub-latency S    Seconds the stub provider waits per call (default: 0)
+    --quiet             Only log warnings and errors
+
+Examples:
+    # Offline dry run of the RAG chain
+    python pipeline.py rag
+
+    # Same chain against GPT-5, with your own context and question
+    python pipeline.py rag --model gpt-5 --context ctx.txt --question q.txt
+
+    # Paper skeleton written to out/
+    python pipeline.py paper --topic "Productivity impacts of remote work" --out-dir out
+"""
+
+import argparse
+import asyncio
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+import re
+import string
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from prompt_automation import ModelConfig, PromptAutomation
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+# Bump whenever prompts or output handling change so cached stage outputs are not reused.
+PIPELINE_VERSION = "1"
+
+DEFAULT_CACHE_DIR = os.environ.get("PIPELINE_CACHE_DIR", ".pipeline_cache")
+DEFAULT_SCHEMA_DIR = str(Path(__file__).resolve().parent.parent / 'JSON-Schemas')
+STUB_MODEL = 'stub'
+
+_FENCED_JSON = re.compile(r'^\s*```(?:json)?\s*\n(.*?)\n\s*```\s*$', re.DOTALL)
+_DOC_LINE = re.compile(r'^\s*\[#([^\]]+)\]\s*(.*)$', re.MULTILINE)
+
+
+@dataclass
+class Stage:
+    """One node of a chain.
+
+    A model stage renders prompt (a string.Template over the chain inputs and the
+    outputs of deps) and sends it to the model; a local stage computes its output
+    from those values with transform instead. JSON outputs are parsed, and checked
+    against schema when one is given.
+    """
+    name: str
+    deps: Tuple[str, ...] = ()
+    prompt: Optional[str] = None
+    system: str = ''
+    transform: Optional[Callable[[Dict[str, Any]], Any]] = None
+    output: Optional[str] = None
+    json_mode: bool = False
+    temperature: float = 0.0
+    schema: Optional[str] = None
+    stub: Optional[Callable[[Dict[str, Any]], Any]] = None
+
+
+@dataclass
+class StageResult:
+    """Outcome of one stage: ran, cached, failed or skipped."""
+    stage: str
+    status: str
+    duration: float = 0.0
+    output: Optional[str] = None
+    errors: List[str] = field(default_factory=list)
+
+
+class StageCache:
+    """On-disk stage output cache, one JSON file per key.
+
+    Keys hash the rendered prompt, so an unchanged upstream output yields the same
+    key downstream and the whole unchanged part of a chain is served from disk.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.write_warned = False
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key_for(stage: Stage, model: str, prompt: str) -> str:
+        digest = hashlib.sha256()
+        header = [PIPELINE_VERSION, stage.name, model, repr(stage.temperature),
+                  str(stage.json_mode), stage.schema or '']
+        digest.update('\0'.join(header).encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(prompt.encode('utf-8', errors='surrogatepass'))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + '.json')
+
+    def get(self, key: str) -> Any:
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: str, value: Any) -> None:
+        # A failed write must not fail a stage whose model call already succeeded
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(value, f, ensure_ascii=False)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            if tmp_path is not None:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+            if not self.write_warned:
+                self.write_warned = True
+                logger.warning(f"Stage cache write failed, continuing uncached: {e}")
+
+
+class StubProvider:
+    """Offline PromptAutomation backend.
+
+    The runner registers each stage's canned response for the exact prompt it is
+    about to send; any other prompt gets a generic placeholder. latency simulates a
+    slow provider so concurrent stages can be observed.
+    """
+
+    config = ModelConfig(
+        name='Local stub',
+        api_key_env='',
+        base_url='local://stub',
+        max_tokens=8192,
+        temperature=0.0,
+        context_window=200000,
+        supports_json_mode=True
+    )
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.responses: Dict[str, str] = {}
+
+    @staticmethod
+    def digest(prompt: str) -> str:
+        return hashlib.sha256(prompt.encode('utf-8', errors='surrogatepass')).hexdigest()
+
+    def expect(self, prompt: str, response: Any) -> None:
+        if not isinstance(response, str):
+            response = json.dumps(response, indent=2, ensure_ascii=False)
+        self.responses[self.digest(prompt)] = response
+
+    async def __call__(self, config: ModelConfig, api_key: Optional[str], prompt: str,
+                       temperature: float, max_tokens: int, json_mode: bool) -> str:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        response = self.responses.get(self.digest(prompt))
+        if response is not None:
+            return response
+        return '{}' if json_mode else f"[stub] No canned response for this {len(prompt.split())}-word prompt."
+
+
+def doc_lines(text: str) -> List[Tuple[str, str]]:
+    """[#id] lines of a context or sources file as (id, rest of line)."""
+    return [(m.group(1), m.group(2).strip()) for m in _DOC_LINE.finditer(text)]
+
+
+def parse_json_output(text: str) -> Any:
+    """Decode a JSON model response, tolerating a surrounding ``` fence."""
+    match = _FENCED_JSON.match(text)
+    return json.loads(match.group(1) if match else text)
+
+
+def load_schema_validator(schema_dir: str) -> Any:
+    """SchemaValidator from schema-validator.py (not importable by name)."""
+    module_name = 'schema_validator'
+    module = sys.modules.get(module_name)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(module_name, Path(__file__).with_name('schema-validator.py'))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        spec.loader.exec_module(module)
+        # Per-schema load and pass messages would drown out the stage log
+        logging.getLogger(module_name).setLevel(logging.WARNING)
+    return module.SchemaValidator(schema_dir, error_mode='all')
+
+
+class PipelineRunner:
+    """Runs a chain of stages as a DAG against one PromptAutomation model."""
+
+    def __init__(self, automation: PromptAutomation, model: str, out_dir: str = '.',
+                 cache: Optional[StageCache] = None, schema_dir: str = DEFAULT_SCHEMA_DIR,
+                 jobs: int = 4, stub: Optional[StubProvider] = None):
+        if model not in automation.models:
+            raise ValueError(f"Unknown model: {model}")
+        self.automation = automation
+        self.model = model
+        self.out_dir = Path(out_dir)
+        self.cache = cache
+        self.schema_dir = schema_dir
+        self.jobs = jobs
+        self.stub = stub
+        self.validator: Optional[asyncio.Future] = None
+        self.query_results: List[Dict[str, Any]] = []
+
+    @staticmethod
+    def check_chain(stages: List[Stage]) -> List[Stage]:
+        """Stages in dependency order; raises ValueError on unknown deps or cycles."""
+        by_name = {stage.name: stage for stage in stages}
+        ordered: List[Stage] = []
+        state: Dict[str, int] = {}  # 1 = visiting, 2 = done
+
+        def visit(stage: Stage, path: Tuple[str, ...]) -> None:
+            if state.get(stage.name) == 2:
+                return
+            if state.get(stage.name) == 1:
+                raise ValueError(f"Dependency cycle: {' -> '.join(path + (stage.name,))}")
+            state[stage.name] = 1
+            for dep in stage.deps:
+                if dep not in by_name:
+                    raise ValueError(f"Stage {stage.name} depends on unknown stage {dep}")
+                visit(by_name[dep], path + (stage.name,))
+            state[stage.name] = 2
+            ordered.append(stage)
+
+        for stage in stages:
+            visit(stage, ())
+        return ordered
+
+    async def run(self, stages: List[Stage], inputs: Dict[str, str]) -> List[StageResult]:
+        """Run every stage once its deps have succeeded; results follow dependency order."""
+        ordered = self.check_chain(stages)
+        if self.validator is None and any(stage.schema for stage in ordered):
+            # Compiling the schemas takes a while; do it off the loop while the first stages run
+            self.validator = asyncio.ensure_future(asyncio.to_thread(load_schema_validator, self.schema_dir))
+        values: Dict[str, Any] = dict(inputs)
+        limit = asyncio.Semaphore(self.jobs)
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def run_stage(stage: Stage) -> StageResult:
+            failed = [dep for dep in stage.deps if (await tasks[dep]).status in ('failed', 'skipped')]
+            if failed:
+                logger.warning(f"{stage.name}: skipped, upstream stage failed: {', '.join(failed)}")
+                return StageResult(stage.name, 'skipped', errors=[f"Upstream stage failed: {', '.join(failed)}"])
+            start = time.perf_counter()
+            try:
+                status, value, errors = await self.execute(stage, values, limit)
+            except Exception as e:
+                status, value, errors = 'failed', None, [f"{type(e).__name__}: {e}"]
+            result = StageResult(stage.name, status, time.perf_counter() - start, errors=errors)
+            if status != 'failed':
+                values[stage.name] = value
+                result.output = self.write_output(stage, value)
+            for error in errors:
+                logger.error(f"{stage.name}: {error}")
+            logger.info(f"{stage.name}: {status} in {result.duration:.2f}s")
+            return result
+
+        # Created in dependency order, so every task a stage awaits already exists
+        for stage in ordered:
+            tasks[stage.name] = asyncio.create_task(run_stage(stage))
+        return [await tasks[stage.name] for stage in ordered]
+
+    async def execute(self, stage: Stage, values: Dict[str, Any],
+                      limit: asyncio.Semaphore) -> Tuple[str, Any, List[str]]:
+        """Produce one stage's output: (status, value, errors)."""
+        if stage.transform is not None:
+            return 'ran', stage.transform(values), []
+
+        prompt = self.render(stage, values)
+        key = StageCache.key_for(stage, self.model, prompt)
+        if self.cache is not None:
+            entry = self.cache.get(key)
+            if entry is not None and not await self.validate(stage, entry['output']):
+                return 'cached', entry['output'], []
+
+        if self.stub is not None and stage.stub is not None:
+            self.stub.expect(prompt, stage.stub(values))
+        async with limit:
+            result = await self.automation.query_model(
+                self.model, prompt, temperature=stage.temperature, json_mode=stage.json_mode)
+        self.query_results.append(result)
+        if not result.get('success'):
+            return 'failed', None, [result.get('error', 'Model query failed')]
+
+        value = result['response']
+        if stage.json_mode:
+            try:
+                value = parse_json_output(value)
+            except ValueError as e:
+                return 'failed', None, [f"Response is not valid JSON: {e}"]
+        errors = await self.validate(stage, value)
+        if errors:
+            return 'failed', None, errors
+        if self.cache is not None:
+            self.cache.put(key, {'stage': stage.name, 'model': self.model, 'output': value})
+        return 'ran', value, []
+
+    @staticmethod
+    def render(stage: Stage, values: Dict[str, Any]) -> str:
+        """Fill the stage prompt; JSON values are inserted pretty-printed."""
+        text_values = {
+            name: value if isinstance(value, str) else json.dumps(value, indent=2, ensure_ascii=False)
+            for name, value in values.items()
+        }
+        prompt = string.Template(stage.prompt).substitute(text_values)
+        return f"{stage.system}\n\n{prompt}" if stage.system else prompt
+
+    async def validate(self, stage: Stage, value: Any) -> List[str]:
+        """Schema errors for a stage output (none when the stage has no schema)."""
+        if not stage.schema:
+            return []
+        validator = await self.validator
+        result = validator.validate_data(value, stage.output or stage.name, stage.schema)
+        for warning in result.warnings:
+            logger.warning(f"{stage.name}: {warning}")
+        return result.errors
+
+    def write_output(self, stage: Stage, value: Any) -> Optional[str]:
+        if not stage.output:
+            return None
+        path = self.out_dir / stage.output
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            if isinstance(value, str):
+                f.write(value if value.endswith('\n') else value + '\n')
+            else:
+                json.dump(value, f, indent=2, ensure_ascii=False)
+                f.write('\n')
+        return str(path)
+
+
+# --- Chain definitions (prompts follow Examples/quickstarts/run_*.sh) ---
+
+SAMPLE_CONTEXT = """[#A] 2021 Journal: task roles improve, collaboration roles decline
+[#B] 2023 Meta-analysis: heterogeneity by autonomy and industry
+"""
+
+SAMPLE_QUESTION = "Summarize productivity impacts of remote work across roles and note uncertainties.\n"
+
+SAMPLE_PAPER_CONTEXT = """[#1] Smith 2021 (Journal of Productivity) "...remote work effects vary by autonomy..."
+[#2] Meta 2023 (Meta-analysis) "...heterogeneity by industry and collaboration intensity..."
+"""
+
+SAMPLE_DATASET = """Dataset: Employee productivity logs (daily), fields: date, employee_id, role, autonomy_score, tasks_completed, meetings_hours.
+Goal: Estimate impact of remote work on productivity while controlling for role and autonomy.
+Constraints: No PII export; code must run offline.
+"""
+
+SAMPLE_SOURCES = """[#A] 2021 Journal Article: "Remote work effects vary by role autonomy" (peer-reviewed)
+[#B] 2023 Meta-analysis: "Industry heterogeneity in productivity outcomes" (peer-reviewed)
+[#C] Blog 2020: "Remote work always boosts productivity" (non-peer-reviewed)
+"""
+
+RAG_SYSTEM = """You are a rigorous research assistant.
+Rules:
+- Use ONLY the provided context.
+- Cite evidence inline with [#doc-id] and quotes.
+- If context is insufficient, say "Insufficient evidence" and list missing info.
+- Do not guess; no external knowledge unless allowed.
+Output sections:
+- Answer (2–5 sentences)
+- Evidence (bullets: [#doc-id] + quoted spans)
+- Open Questions (if any)"""
+
+PAPER_SYSTEM = ("Output LaTeX only. Compile-safe macros. Use \\section, \\subsection, \\label. "
+                "Use \\cite{key} only if a real key is provided; otherwise write [to-collect: key-hint]. "
+                "No commentary.")
+
+CHART_VIEWER = """<!doctype html>
+<meta charset="utf-8">
+<script src="https://cdn.jsdelivr.net/npm/vega@5"></script>
+<script src="https://cdn.jsdelivr.net/npm/vega-lite@5"></script>
+<script src="https://cdn.jsdelivr.net/npm/vega-embed@6"></script>
+<div id="vis"></div>
+<script>
+fetch('chart1.json').then(r=>r.json()).then(spec=>vegaEmbed('#vis', spec));
+</script>
+"""
+
+RUBRIC_CRITERIA = ('accuracy', 'completeness', 'clarity', 'integrity', 'actionability')
+
+
+def _stub_answer(values: Dict[str, Any]) -> str:
+    docs = doc_lines(values['context'])
+    cited = ' '.join(f"[#{doc_id}]" for doc_id, _ in docs) or 'the provided context'
+    evidence = '\n'.join(f'- [#{doc_id}] "{text}"' for doc_id, text in docs) or '- Insufficient evidence'
+    return (f"## Answer\nThe provided sources address the question only in part: {values['question'].strip()} "
+            f"Effects differ by role and autonomy {cited}.\n\n## Evidence\n{evidence}\n\n"
+            "## Open Questions\n- Effect sizes and study populations are not given in the context.\n")
+
+
+def _stub_evaluation(values: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'score': 4,
+        'criteria': {name: {'score': 4, 'notes': 'Offline stub evaluation.'} for name in RUBRIC_CRITERIA},
+        'issues': [{'type': 'completeness', 'span': 'Open Questions', 'fix': 'Add effect sizes when available.'}]
+    }
+
+
+def _stub_brief(values: Dict[str, Any]) -> str:
+    return ("# Research Brief\n\n## Context and question\nStub brief derived from the RAG answer.\n\n"
+            f"## What the evidence says\n{values['answer'].strip()}\n\n"
+            "## Uncertainties and gaps\n- See Open Questions above.\n\n"
+            "## Practical implications\n- Treat the findings as role-dependent.\n")
+
+
+def _stub_paper(values: Dict[str, Any]) -> str:
+    cited = ' '.join(f"[#{doc_id}]" for doc_id, _ in doc_lines(values['context']))
+    sections = '\n\n'.join(
+        f"\\section{{{title}}}\\label{{sec:{title.lower().replace(' ', '-')}}}\n[to-collect: {title.lower()}]"
+        for title in ('Related Work', 'Method', 'Results', 'Discussion', 'Limitations', 'Conclusion'))
+    return (f"\\section{{Introduction}}\\label{{sec:introduction}}\n{values['topic'].strip()} {cited}\n\n{sections}\n\n"
+            "\\begin{figure}[h]\\centering\\fbox{TBD}\\caption{Placeholder}\\label{fig:main}\\end{figure}\n"
+            "\\begin{table}[h]\\centering\\begin{tabular}{ll}A & B\\\\\\end{tabular}"
+            "\\caption{Placeholder}\\label{tab:main}\\end{table}\n")
+
+
+def _stub_zotero(values: Dict[str, Any]) -> str:
+    ids = sorted(set(re.findall(r'\[#([^\]]+)\]', values['paper'])))
+    return ''.join(f"- [to-collect] source {doc_id} | venue? | year? | DOI/URL? | key{doc_id}\n" for doc_id in ids) \
+        or "- [to-collect] no inline [#id] citations found\n"
+
+
+def _stub_analysis_plan(values: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'questions': ['Does remote work change tasks_completed per day?'],
+        'features': ['role', 'autonomy_score', 'meetings_hours'],
+        'methods': ['Fixed-effects regression by employee'],
+        'confounders': ['role', 'autonomy_score'],
+        'validation': ['Hold-out period comparison']
+    }
+
+
+def _stub_analysis_report(values: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'summary': 'Offline stub report; no data was analysed.',
+        'findings': ['Placeholder finding pending a real model run.'],
+        'metrics': {'rows_analysed': 0},
+        'charts': [{
+            'title': 'Tasks completed by role',
+            'vegaLiteSpec': {
+                '$schema': 'https://vega.github.io/schema/vega-lite/v5.json',
+                'data': {'values': [{'role': 'task', 'tasks': 0}, {'role': 'collaboration', 'tasks': 0}]},
+                'mark': 'bar',
+                'encoding': {'x': {'field': 'role', 'type': 'nominal'},
+                             'y': {'field': 'tasks', 'type': 'quantitative'}}
+            },
+            'altText': 'Bar chart of tasks completed per role (placeholder values).'
+        }],
+        'assumptions': ['Stub data only.'],
+        'limitations': ['Generated offline by the stub provider.']
+    }
+
+
+def _stub_kb_extract(values: Dict[str, Any]) -> Dict[str, Any]:
+    docs = doc_lines(values['sources'])
+    return {
+        'entities': [{'type': 'Source', 'name': doc_id, 'aliases': []} for doc_id, _ in docs],
+        'relations': [{'subject': doc_id, 'predicate': 'discusses', 'object': 'remote work productivity',
+                       'evidence': f"{doc_id}:{text}"} for doc_id, text in docs]
+    }
+
+
+def _stub_source_graph(values: Dict[str, Any]) -> Dict[str, Any]:
+    nodes = []
+    for doc_id, text in doc_lines(values['sources']):
+        year = re.search(r'\b(19|20)\d{2}\b', text)
+        peer_reviewed = '(peer-reviewed)' in text
+        nodes.append({'id': doc_id, 'type': 'source', 'year': int(year.group(0)) if year else None,
+                      'trust': 0.8 if peer_reviewed else 0.3,
+                      'rationale': 'peer-reviewed' if peer_reviewed else 'not peer-reviewed'})
+    return {'nodes': nodes, 'edges': []}
+
+
+def _stub_kb_plan(values: Dict[str, Any]) -> str:
+    return ("# KB Update Plan\n\n1. (high) Add [#D] 2024 RCT and its collaboration-overhead relation.\n"
+            "2. (medium) Flag contradictions with non-peer-reviewed sources.\n"
+            "3. (low) Rewrite the productivity summary section.\n")
+
+
+def _field(stage: str, key: str) -> Callable[[Dict[str, Any]], Any]:
+    def extract(values: Dict[str, Any]) -> Any:
+        value = values[stage]
+        if not isinstance(value, dict) or key not in value:
+            raise ValueError(f"{stage} output has no '{key}' field")
+        return value[key]
+    return extract
+
+
+def _first_chart(values: Dict[str, Any]) -> Any:
+    charts = values['report'].get('charts') or []
+    if not charts:
+        raise ValueError("report has no charts")
+    return charts[0]['vegaLiteSpec']
+
+
+CHAINS: Dict[str, List[Stage]] = {
+    'rag': [
+        Stage('answer', system=RAG_SYSTEM, output='rag_answer.md', stub=_stub_answer,
+              prompt="Context (---):\n---\n${context}\n---\n\nQuestion:\n${question}"),
+        Stage('evaluation', deps=('answer',), output='evaluation.json', json_mode=True,
+              schema='prompt-eval-rubric', stub=_stub_evaluation,
+              prompt=("Evaluate the following answer against JSON-Schemas/prompt-eval-rubric.json "
+                      "and return JSON only.\nAnswer:\n<<<\n${answer}\n>>>")),
+        Stage('brief', deps=('answer',), output='research_brief.md', temperature=0.2, stub=_stub_brief,
+              prompt=("Write a 1-page research brief:\n- Context and question\n"
+                      "- What the evidence says (with [#doc-id] citations)\n- Uncertainties and gaps\n"
+                      "- Practical implications\nTone: concise, neutral, non-speculative. "
+                      "Use content from the Answer below.\nAnswer:\n<<<\n${answer}\n>>>")),
+    ],
+    'paper': [
+        Stage('paper', system=PAPER_SYSTEM, output='paper.tex', temperature=0.1, stub=_stub_paper,
+              prompt=("Context (--- delimited, cite with [#id] in text, not \\cite):\n---\n${context}\n---\n"
+                      "Task: Create a paper skeleton for:\n${topic}\nInclude:\n"
+                      "- \\section{Introduction} (1 paragraph; [#id] inline citations)\n"
+                      "- \\section{Related Work}\n- \\section{Method}\n- \\section{Results}\n"
+                      "- \\section{Discussion}\n- \\section{Limitations}\n- \\section{Conclusion}\n"
+                      "Add one figure and one table stub with \\label.")),
+        Stage('zotero_todo', deps=('paper',), output='zotero_todo.md', stub=_stub_zotero,
+              prompt=("From the outline topics and inline [#id] mentions, list the key references to collect. "
+                      "Do not fabricate. For each item output: [to-collect] title | venue | year | "
+                      "DOI/URL if known | suggested BibTeX key.\nOutline:\n<<<\n${paper}\n>>>")),
+    ],
+    'analysis': [
+        Stage('plan', output='analysis_plan.json', json_mode=True, stub=_stub_analysis_plan,
+              prompt=("Return a JSON analysis plan with fields: questions, features, methods, confounders, "
+                      "validation. Use only the dataset/goals below.\nDataset & Goals:\n<<<\n${dataset}\n>>>")),
+        Stage('report', output='analysis_report.json', json_mode=True, schema='data-analysis-report',
+              stub=_stub_analysis_report,
+              prompt=("Produce a data analysis report matching JSON-Schemas/data-analysis-report.json. "
+                      "Include: summary, findings, metrics, and at least one Vega-Lite spec chart with altText. "
+                      "Keep assumptions and limitations explicit.\nDataset & Goals:\n<<<\n${dataset}\n>>>")),
+        Stage('chart', deps=('report',), output='charts/chart1.json', transform=_first_chart),
+        Stage('viewer', output='charts/view.html', transform=lambda values: CHART_VIEWER),
+    ],
+    'kb': [
+        Stage('extract', output='kb_extract.json', json_mode=True, stub=_stub_kb_extract,
+              prompt=("From the context, extract:\n- Entities (type, canonical name, aliases)\n"
+                      "- Relations (subject, predicate, object, evidence [doc-id:quote])\n"
+                      "Return JSON with two arrays: entities, relations. Do not add external facts.\n"
+                      "Context:\n<<<\n${sources}\n>>>")),
+        Stage('graph', output='source_graph.json', json_mode=True, stub=_stub_source_graph,
+              prompt=("Build a source graph:\n- Nodes: sources with metadata (id, type, venue, year)\n"
+                      "- Edges: citation/derivation links\nAssign a trust score per node (0–1) with rationale: "
+                      "peer-reviewed recent > blog.\nReturn JSON {nodes:[], edges:[]} using only provided sources.\n"
+                      "Sources:\n<<<\n${sources}\n>>>")),
+        Stage('update_plan', output='kb_update_plan.md', stub=_stub_kb_plan,
+              prompt=("Given new docs below, propose updates to the KB:\n- New entities/relations with evidence\n"
+                      "- Retractions/contradictions\n- Sections to rewrite\n"
+                      "Return a concise Markdown plan with priorities.\nNew Docs:\n"
+                      "[#D] 2024 RCT: \"Collaboration overhead increases remote latency\" (peer-reviewed)")),
+        Stage('entities', deps=('extract',), output='kb_entities.json', transform=_field('extract', 'entities')),
+        Stage('relations', deps=('extract',), output='kb_relations.json', transform=_field('extract', 'relations')),
+    ],
+}
+
+
+def read_text(path: Optional[str], default: str) -> str:
+    if not path:
+        return default
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def chain_inputs(args: argparse.Namespace) -> Dict[str, str]:
+    if args.chain == 'rag':
+        return {'context': read_text(args.context, SAMPLE_CONTEXT), 'question': read_text(args.question, SAMPLE_QUESTION)}
+    if args.chain == 'paper':
+        return {'context': read_text(args.context, SAMPLE_PAPER_CONTEXT), 'topic': args.topic}
+    if args.chain == 'analysis':
+        return {'dataset': read_text(args.dataset, SAMPLE_DATASET)}
+    return {'sources': read_text(args.sources, SAMPLE_SOURCES)}
+
+
+def main():
+    """Main CLI interface"""
+    parser = argparse.ArgumentParser(description="Run a quickstart chain as a cached, concurrent DAG")
+    parser.add_argument('chain', choices=sorted(CHAINS), help='Chain to run')
+    parser.add_argument('--model', default=STUB_MODEL, help='stub (offline), gpt-5, claude-4.1 or grok-4')
+    parser.add_argument('--context', help='rag/paper context file')
+    parser.add_argument('--question', help='rag question file')
+    parser.add_argument('--topic', help='paper topic (required for paper)')
+    parser.add_argument('--dataset', help='analysis dataset description file')
+    parser.add_argument('--sources', help='kb sources file')
+    parser.add_argument('--out-dir', default='.', help='Directory for stage output files')
+    parser.add_argument('--jobs', type=int, default=4, help='Maximum concurrent model calls')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help='Stage cache directory')
+    parser.add_argument('--no-cache', action='store_true', help='Always re-run stages; do not read or write the cache')
+    parser.add_argument('--schema-dir', default=DEFAULT_SCHEMA_DIR, help='Directory containing JSON schemas')
+    parser.add_argument('--stub-latency', type=float, default=0.0, help='Seconds the stub provider waits per call')
+    parser.add_argument('--quiet', action='store_true', help='Only log warnings and errors')
+
+    args = parser.parse_args()
+    if args.chain == 'paper' and not args.topic:
+        parser.error('--topic is required for the paper chain')
+    if args.jobs < 1:
+        parser.error('--jobs must be at least 1')
+    if args.quiet:
+        logging.getLogger().setLevel(logging.WARNING)
+
+    automation = PromptAutomation()
+    stub = None
+    if args.model == STUB_MODEL:
+        stub = StubProvider(args.stub_latency)
+        automation.register_backend(STUB_MODEL, stub.config, stub)
+    if args.model not in automation.models:
+        parser.error(f"unknown model {args.model} (choose from {', '.join(sorted(automation.models))})")
+
+    try:
+        inputs = chain_inputs(args)
+    except OSError as e:
+        logger.error(f"Cannot read input: {e}")
+        sys.exit(1)
+
+    cache = None
+    if not args.no_cache:
+        try:
+            cache = StageCache(args.cache_dir)
+        except OSError as e:
+            logger.warning(f"Stage cache unavailable, continuing uncached: {e}")
+    runner = PipelineRunner(automation, args.model, args.out_dir, cache=cache,
+                            schema_dir=args.schema_dir, jobs=args.jobs, stub=stub)
+    start = time.perf_counter()
+    results = asyncio.run(runner.run(CHAINS[args.chain], inputs))
+    elapsed = time.perf_counter() - start
+
+    if not args.quiet:
+        for result in results:
+            print(f"{result.stage:<12} {result.status:<8} {result.duration:6.2f}s  {result.output or ''}")
+        ran = sum(1 for r in results if r.status == 'ran')
+        cached = sum(1 for r in results if r.status == 'cached')
+        print(f"{args.chain}: {len(results)} stages, {ran} ran, {cached} cached in {elapsed:.2f}s")
+    automation.executor.shutdown(wait=False)
+    if any(r.status in ('failed', 'skipped') for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -15,28 +15,39 @@ import os
 import json
 import time
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Awaitable, Callable, Dict, List, Optional, Any
 from datetime import datetime
 from dataclasses import dataclass
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
-import requests
-from dotenv import load_dotenv
+
+try:
+    from dotenv import load_dotenv
+except ImportError:  # optional: environment variables can be exported directly
+    load_dotenv = None
 
 # Load environment variables
-load_dotenv()
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('prompt_automation.log'),
-        logging.StreamHandler()
-    ]
-)
+if load_dotenv is not None:
+    load_dotenv()
+
 logger = logging.getLogger(__name__)
 
+
+def configure_logging() -> None:
+    """Log to prompt_automation.log and the console when run as a script.
+
+    Not done at import time, so modules that build on PromptAutomation (such as
+    pipeline.py) keep their own logging setup and do not create the log file.
+    """
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler('prompt_automation.log'),
+            logging.StreamHandler()
+        ]
+    )
+
 @dataclass
 class ModelConfig:
     """Configuration for different AI models"""
@@ -49,6 +60,10 @@ class ModelConfig:
     supports_streaming: bool = False
     supports_json_mode: bool = False
 
+
+# Async callable (config, api_key, prompt, temperature, max_tokens, json_mode) -> response text
+Backend = Callable[[ModelConfig, Optional[str], str, float, int, bool], Awaitable[str]]
+
 class PromptAutomation:
     """
     Comprehensive prompt automation system for 2025 AI models
@@ -95,6 +110,12 @@ class PromptAutomation:
             )
         }
 
+        self.backends: Dict[str, Backend] = {
+            'gpt-5': self._query_openai,
+            'claude-4.1': self._query_anthropic,
+            'grok-4': self._query_xai
+        }
+
         self.executor = ThreadPoolExecutor(max_workers=3)
         self.session_stats = {
             'total_requests': 0,
@@ -104,10 +125,21 @@ class PromptAutomation:
             'total_cost': 0.0
         }
 
+    def register_backend(self, model_name: str, config: ModelConfig, backend: Backend) -> None:
+        """Add (or replace) a model served by backend.
+
+        A config with an empty api_key_env marks a local backend that needs no key.
+        """
+        self.models[model_name] = config
+        self.backends[model_name] = backend
+
     def validate_api_keys(self) -> Dict[str, bool]:
         """Validate that required API keys are available"""
         key_status = {}
         for model_name, config in self.models.items():
+            if not config.api_key_env:
+                key_status[model_name] = True
+                continue
             api_key = os.getenv(config.api_key_env)
             key_status[model_name] = api_key is not None and len(api_key) > 0
 
@@ -128,9 +160,12 @@ class PromptAutomation:
             raise ValueError(f"Unknown model: {model_name}")
 
         config = self.models[model_name]
-        api_key = os.getenv(config.api_key_env)
+        backend = self.backends.get(model_name)
+        if backend is None:
+            raise ValueError(f"Model {model_name} not implemented")
 
-        if not api_key:
+        api_key = os.getenv(config.api_key_env) if config.api_key_env else None
+        if config.api_key_env and not api_key:
             raise ValueError(f"API key not found for {model_name}")
 
         # Use provided parameters or defaults
@@ -140,14 +175,7 @@ class PromptAutomation:
         try:
             start_time = time.time()
 
-            if model_name == 'gpt-5':
-                response = await self._query_openai(config, api_key, prompt, temp, max_tok, json_mode)
-            elif model_name == 'claude-4.1':
-                response = await self._query_anthropic(config, api_key, prompt, temp, max_tok, json_mode)
-            elif model_name == 'grok-4':
-                response = await self._query_xai(config, api_key, prompt, temp, max_tok, json_mode)
-            else:
-                raise ValueError(f"Model {model_name} not implemented")
+            response = await backend(config, api_key, prompt, temp, max_tok, json_mode)
 
             end_time = time.time()
 
@@ -220,6 +248,8 @@ class PromptAutomation:
     async def _query_xai(self, config: ModelConfig, api_key: str,
                         prompt: str, temp: float, max_tokens: int, json_mode: bool) -> str:
         """Query XAI Grok model"""
+        import aiohttp
+
         headers = {
             'Authorization': f'Bearer {api_key}',
             'Content-Type': 'application/json'
@@ -460,6 +490,7 @@ async def main():
         logger.warning("No valid API keys found. Please configure API keys to run automation.")
 
 if __name__ == "__main__":
+    configure_logging()
     try:
         # Check if running in Jupyter or as script
         import sys
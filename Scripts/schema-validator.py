@@ -16,9 +16,29 @@ Usage:
 
 Options:
     --schema-dir DIR    Directory containing JSON schemas (default: ../JSON-Schemas)
-    --batch             Process all files in batch mode
-    --report            Generate detailed HTML report
+    --rules-dir DIR     Directory containing quality rules (default: Quality-Rules next to
+                        the schema directory)
+    --batch             Process all JSON/JSONL files under the current directory, recursively
+    --include GLOB      Only validate discovered files matching GLOB (repeatable)
+    --exclude GLOB      Skip discovered files and directories matching GLOB (repeatable)
+    --watch             Keep polling and revalidate files as they change (Ctrl-C to stop)
+    --watch-interval S  Polling interval in seconds for --watch (default: 2)
+    --report            Generate detailed HTML report (same as --format html)
+    --format FMT        text (default), html, json or junit; written incrementally
+    --output PATH       Write the report to PATH instead of stdout
     --strict            Fail on first validation error
+    --jobs N            Validate with N worker processes (default: 1)
+    --array             Stream .json files whose top level is an array, element by element
+    --detect-verify     When auto-detecting, validate ranked candidate schemas and
+                        pick the first one the document passes
+    --manifest PATH     Reuse results for files unchanged since the last run, stored in
+                        the SQLite file PATH
+    --incremental       Same as --manifest .schema-validator-manifest.sqlite
+    --decoder NAME      auto (orjson if installed, default), json or orjson
+    --benchmark         Time reading and decoding the given files per schema and decoder
+    --error-mode MODE   best (one best-match error, default), all (every error with its
+                        JSON pointer, capped by --max-errors) or fast (valid/invalid only)
+    --max-errors N      Errors reported per file with --error-mode all (default: 20)
     --quiet             Suppress non-error output
     --help             Show this help message
 
@@ -29,25 +49,238 @@ Examples:
     # Batch validate all quickstart outputs
     python schema-validator.py --batch --schema-dir ../JSON-Schemas
 
+    # Validate a directory tree, skipping drafts
+    python schema-validator.py outputs/ --exclude 'drafts/*'
+
+    # Revalidate a continuously written output directory as files change
+    python schema-validator.py --watch outputs/
+
+    # Spread a large batch over 8 worker processes
+    python schema-validator.py --batch --jobs 8
+
+    # Stream a JSONL/NDJSON run log; results are reported per line number
+    python schema-validator.py run-outputs.jsonl
+
+    # Compare JSON decoders on the sample outputs in the current directory
+    python schema-validator.py --benchmark --batch
+
+    # Re-run CI validation, revalidating only files or schemas that changed
+    python schema-validator.py --batch --incremental
+
     # Generate detailed report
     python schema-validator.py --report --batch > validation_report.html
+
+    # JUnit XML for CI test-result viewers
+    python schema-validator.py --batch --format junit --output schema-results.xml
 """
 
 import json
 import jsonschema
+import referencing
+import referencing.exceptions
+from referencing.jsonschema import DRAFT202012
 import argparse
+import fnmatch
+import gc
+import glob
+import hashlib
+import html
+import io
+import mmap
+import queue
+import re
+import sqlite3
+import stat
+import string
 import sys
 import os
+import threading
+import time
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any
-from dataclasses import dataclass
+from urllib.parse import urldefrag, urljoin, urlsplit
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple, Any
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
+from dataclasses import asdict, dataclass
 from datetime import datetime
+from xml.sax.saxutils import escape as xml_escape, quoteattr
 import logging
 
+try:
+    import orjson
+except ImportError:  # optional: faster decoding for large batches
+    orjson = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 logger = logging.getLogger(__name__)
 
+JSONL_SUFFIXES = ('.jsonl', '.ndjson')
+VALIDATED_SUFFIXES = ('.json',) + JSONL_SUFFIXES
+_NUMBER_CHARS = frozenset('0123456789.eE+-')
+ERROR_MODES = ('best', 'all', 'fast')
+
+# Bump whenever validation or scoring logic changes so manifest entries are not reused.
+VALIDATOR_VERSION = "2"
+DEFAULT_MANIFEST = '.schema-validator-manifest.sqlite'
+DEFAULT_SCHEMA = 'research-analysis'
+SHARED_SCHEMA_DIR = 'shared'
+QUALITY_RULES_DIR = 'Quality-Rules'
+COMMON_RULES = 'common'
+# Keywords that never change whether an instance is valid
+ANNOTATION_KEYWORDS = frozenset({'description', 'title', 'examples', 'default', '$comment',
+                                 'deprecated', 'readOnly', 'writeOnly'})
+# Keywords whose values are data, not subschemas, and must not be searched for $ref
+NON_SCHEMA_KEYWORDS = frozenset({'const', 'enum', 'examples', 'default', 'required'})
+# Keywords whose values map names to subschemas
+SCHEMA_MAP_KEYWORDS = frozenset({'properties', 'patternProperties', '$defs', 'definitions', 'dependentSchemas'})
+
+
+def json_pointer(path: Iterable[Any]) -> str:
+    """Render an error path as a JSON Pointer fragment, e.g. #/findings/0/evidence."""
+    return '#' + ''.join('/' + str(part).replace('~', '~0').replace('/', '~1') for part in path)
+
+
+def _stdlib_loads(buf: Any) -> Any:
+    if isinstance(buf, bytes):
+        return json.loads(buf)
+    # Decode a memory-mapped file straight from the mapping instead of copying it to bytes first
+    return json.loads(str(buf, 'utf-8-sig'))
+
+
+def _orjson_loads(buf: Any) -> Any:
+    try:
+        return orjson.loads(buf)
+    except orjson.JSONDecodeError:
+        # orjson rejects NaN/Infinity and BOMs that json accepts, and words its errors
+        # differently; rare failures go through json so verdicts and messages match it
+        return _stdlib_loads(buf)
+
+
+# Decoders take bytes or a memoryview over a mapped file
+JSON_DECODERS = {'json': _stdlib_loads}
+if orjson is not None:
+    JSON_DECODERS['orjson'] = _orjson_loads
+DECODER_CHOICES = ('auto', 'json', 'orjson')
+# Files at least this large are memory-mapped rather than read into a buffer
+MMAP_THRESHOLD = 1 << 20
+# Directory names never descended into when walking (hidden directories are skipped too)
+SKIPPED_DIRS = frozenset({'__pycache__', 'node_modules'})
+# Files discovery may run ahead of validation, and plain JSON files validated per run
+DISCOVERY_QUEUE_SIZE = 4096
+VALIDATION_RUN_SIZE = 1024
+
+
+def compile_globs(patterns: Iterable[str]) -> Optional[Callable[[str], Any]]:
+    """One matcher for a list of shell globs, or None when there are none."""
+    patterns = list(patterns)
+    if not patterns:
+        return None
+    return re.compile('|'.join(fnmatch.translate(pattern) for pattern in patterns)).match
+
+
+def resolve_decoder(name: str) -> str:
+    """Map a --decoder choice to an installed decoder; auto prefers orjson."""
+    if name == 'auto':
+        return 'orjson' if 'orjson' in JSON_DECODERS else 'json'
+    if name not in JSON_DECODERS:
+        raise ValueError(f"JSON decoder '{name}' is not installed")
+    return name
+
+
+def read_document(file_path: str, decode, size_hint: Optional[int] = None) -> Tuple[Any, int]:
+    """Read and decode a whole file; returns (document, size in bytes).
+
+    Small files are read with a single os.read sized from size_hint (the stat
+    taken while collecting files, so no further stat is needed). Files of
+    MMAP_THRESHOLD bytes or more are memory-mapped and decoded from the mapping
+    with the cyclic garbage collector paused.
+    """
+    fd = os.open(file_path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+    try:
+        if size_hint is None:
+            size_hint = os.fstat(fd).st_size
+        if size_hint >= MMAP_THRESHOLD:
+            # Decoding allocates only acyclic containers, so the cyclic collector
+            # repeatedly rescanning them while a large file is decoded is pure overhead
+            gc_enabled = gc.isenabled()
+            gc.disable()
+            try:
+                with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+                    return decode(view), len(view)
+            finally:
+                if gc_enabled:
+                    gc.enable()
+        chunks = []
+        to_read = size_hint + 1  # one byte over, so a file read in full needs no second pass
+        while True:
+            chunk = os.read(fd, to_read)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            to_read = 1 << 16
+        raw = chunks[0] if len(chunks) == 1 else b''.join(chunks)
+        return decode(raw), len(raw)
+    finally:
+        os.close(fd)
+
+
+def iter_json_array(f: TextIO, chunk_size: int = 1 << 16) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array, reading the file in chunks.
+
+    Memory stays proportional to the largest element rather than the file.
+    Raises ValueError if the document is not a well-formed array.
+    """
+    decoder = json.JSONDecoder()
+    buf, pos, eof = '', 0, False
+
+    def refill() -> None:
+        nonlocal buf, pos, eof
+        chunk = f.read(max(chunk_size, len(buf) - pos))  # grow for large elements
+        buf, pos, eof = buf[pos:] + chunk, 0, not chunk
+
+    def peek() -> str:
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in ' \t\r\n':
+                pos += 1
+            if pos < len(buf) or eof:
+                return buf[pos:pos + 1]
+            refill()
+
+    if peek() != '[':
+        raise ValueError("expected a top-level JSON array")
+    pos += 1
+    if peek() == ']':
+        pos += 1
+        if peek():
+            raise ValueError("unexpected data after the top-level JSON array")
+        return
+    while True:
+        peek()
+        while True:
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+                # A number that ends at (or next to) the buffer edge may be cut short
+                if eof or (end < len(buf) and buf[end] not in _NUMBER_CHARS):
+                    break
+            except ValueError:
+                if eof:
+                    raise
+            refill()
+        pos = end
+        yield item
+        sep = peek()
+        if sep == ']':
+            pos += 1
+            if peek():
+                raise ValueError("unexpected data after the top-level JSON array")
+            return
+        if sep != ',':
+            raise ValueError(f"expected ',' or ']' in JSON array, found {sep!r}")
+        pos += 1
+
+
 @dataclass
 class ValidationResult:
     """Result of a single validation operation."""
@@ -70,75 +303,623 @@ class ValidationReport:
     results: List[ValidationResult]
     summary: Dict[str, Any]
 
+_MISSING = object()
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float))
+
+
+# Predicates a quality rule can apply to the value at its path. A missing value
+# behaves like null except for "missing"/"present", and comparisons only match numbers.
+_UNARY_PREDICATES = {
+    'missing': lambda v: v is _MISSING,
+    'present': lambda v: v is not _MISSING,
+    'truthy': lambda v: v is not _MISSING and bool(v),
+    'falsy': lambda v: v is _MISSING or not v,
+    'empty': lambda v: v is _MISSING or v is None or (isinstance(v, (str, list, dict)) and len(v) == 0),
+}
+_BINARY_PREDICATES = {
+    'eq': lambda v, arg: v is not _MISSING and v == arg,
+    'ne': lambda v, arg: v is _MISSING or v != arg,
+    'lt': lambda v, arg: _is_number(v) and v < arg,
+    'le': lambda v, arg: _is_number(v) and v <= arg,
+    'gt': lambda v, arg: _is_number(v) and v > arg,
+    'ge': lambda v, arg: _is_number(v) and v >= arg,
+    'in': lambda v, arg: (None if v is _MISSING else v) in arg,
+    'not_in': lambda v, arg: (None if v is _MISSING else v) not in arg,
+}
+
+
+def compile_predicate(spec: Any):
+    """Turn "falsy" or {"lt": 0.5} into a one-argument test."""
+    if isinstance(spec, str) and spec in _UNARY_PREDICATES:
+        return _UNARY_PREDICATES[spec]
+    if isinstance(spec, dict) and len(spec) == 1:
+        (op, arg), = spec.items()
+        if op in _BINARY_PREDICATES:
+            test = _BINARY_PREDICATES[op]
+            if op in ('in', 'not_in') and not isinstance(arg, list):
+                raise ValueError(f"predicate {op!r} needs a list")
+            return lambda v: test(v, arg)
+    raise ValueError(f"unknown predicate: {spec!r}")
+
+
+def parse_rule_path(path: str) -> List[Tuple[str, Optional[str]]]:
+    """Split a rule path into steps.
+
+    "a.b" descends into keys, "a[*]" visits each item of the list at a, and a
+    bare "*" visits each value of an object with its key bound to {key}.
+    """
+    steps: List[Tuple[str, Optional[str]]] = []
+    for part in path.split('.') if path else []:
+        if part == '*':
+            steps.append(('values', None))
+            continue
+        name, wildcard = (part[:-3], True) if part.endswith('[*]') else (part, False)
+        if not name or '[' in name or '*' in name:
+            raise ValueError(f"bad path segment {part!r} in {path!r}")
+        steps.append(('key', name))
+        if wildcard:
+            steps.append(('items', None))
+    return steps
+
+
+def lookup(value: Any, keys: Tuple[str, ...], default: Any = _MISSING) -> Any:
+    """Follow object keys from value; anything missing or not an object gives default."""
+    for key in keys:
+        if not isinstance(value, dict) or key not in value:
+            return default
+        value = value[key]
+    return value
+
+
+@dataclass
+class QualityRule:
+    """A compiled quality rule: where to look, what to test and what it costs.
+
+    The path is split at its last wildcard: anchor is the part walked by the
+    engine (ending at a wildcard, or empty for a plain path) and tail the keys
+    looked up from each anchored node. A missing container before the wildcard
+    yields no matches; a missing key after it yields default.
+    """
+    index: int
+    anchor: Tuple[Tuple[str, Optional[str]], ...]
+    tail: Tuple[str, ...]
+    default: Any
+    predicate: Any
+    penalty: float
+    message: str
+    aggregate: str = 'each'
+    fields: Tuple[Tuple[str, Tuple[str, ...], Any], ...] = ()
+    when: Optional[Tuple[Tuple[str, ...], Any, Any]] = None
+
+    @classmethod
+    def from_spec(cls, index: int, spec: Dict[str, Any]) -> 'QualityRule':
+        steps = parse_rule_path(spec.get('path', ''))
+        cut = max((i + 1 for i, (kind, _) in enumerate(steps) if kind != 'key'), default=0)
+        when = None
+        if 'when' in spec:
+            when_steps = parse_rule_path(spec['when']['path'])
+            if any(kind != 'key' for kind, _ in when_steps):
+                raise ValueError("'when' paths cannot contain wildcards")
+            when = (tuple(name for _, name in when_steps), spec['when'].get('default', _MISSING),
+                    compile_predicate(spec['when']['predicate']))
+        aggregate = spec.get('aggregate', 'each')
+        if aggregate not in ('each', 'count'):
+            raise ValueError(f"unknown aggregate {aggregate!r}")
+        fields = spec.get('fields', {})
+        known = {'count'} if aggregate == 'count' else {'value', 'key', *fields}
+        for _, name, _, _ in string.Formatter().parse(spec['message']):
+            if name is not None and name.split('.')[0].split('[')[0] not in known:
+                raise ValueError(f"message placeholder {{{name}}} is not one of {sorted(known)}")
+        return cls(
+            index=index,
+            anchor=tuple(steps[:cut]),
+            tail=tuple(name for _, name in steps[cut:]),
+            default=spec.get('default', _MISSING),
+            predicate=compile_predicate(spec['predicate']),
+            penalty=float(spec['penalty']),
+            message=spec['message'],
+            aggregate=aggregate,
+            fields=tuple((name, tuple(n for _, n in parse_rule_path(field['path'])), field.get('default'))
+                         for name, field in fields.items()),
+            when=when,
+        )
+
+
+class QualityRuleEngine:
+    """Evaluate a schema's quality rules in a single walk of the document.
+
+    Rule anchors are merged into a trie, so containers shared by several rules
+    are visited once, and only the branches some rule needs are walked.
+    Warnings come out in rule order, and in document order within a rule.
+    """
+
+    def __init__(self, rules: List[QualityRule]):
+        self.rules = rules
+        self.conditional = [rule for rule in rules if rule.when is not None]
+        self.trie: Dict[str, Any] = {'rules': [], 'children': {}}
+        for rule in rules:
+            node = self.trie
+            for step in rule.anchor:
+                node = node['children'].setdefault(step, {'rules': [], 'children': {}})
+            node['rules'].append(rule)
+
+    def evaluate(self, data: Any) -> Tuple[float, List[str]]:
+        """Return (total penalty, warnings) for data."""
+        inactive = {rule.index for rule in self.conditional
+                    if not rule.when[2](lookup(data, rule.when[0], rule.when[1]))}
+        hits: Dict[int, List[Dict[str, Any]]] = {}
+        self.walk(self.trie, data, None, inactive, hits)
+
+        penalty = 0.0
+        warnings = []
+        for rule in self.rules:
+            matches = hits.get(rule.index)
+            if not matches:
+                continue
+            penalty += rule.penalty * len(matches)
+            if rule.aggregate == 'count':
+                warnings.append(rule.message.format_map({'count': len(matches)}))
+            else:
+                warnings.extend(rule.message.format_map(match) for match in matches)
+        return penalty, warnings
+
+    def walk(self, node: Dict[str, Any], value: Any, key: Any, inactive: set,
+             hits: Dict[int, List[Dict[str, Any]]]) -> None:
+        for rule in node['rules']:
+            if rule.index in inactive:
+                continue
+            checked = lookup(value, rule.tail, rule.default)
+            if rule.predicate(checked):
+                match = {'value': None if checked is _MISSING else checked, 'key': key}
+                for name, keys, default in rule.fields:
+                    match[name] = lookup(value, keys, default)
+                hits.setdefault(rule.index, []).append(match)
+
+        for (kind, name), child in node['children'].items():
+            if kind == 'key':
+                if isinstance(value, dict) and name in value:
+                    self.walk(child, value[name], key, inactive, hits)
+            elif kind == 'items':
+                if isinstance(value, list):
+                    for i, item in enumerate(value):
+                        self.walk(child, item, i, inactive, hits)
+            elif isinstance(value, dict):
+                for item_key, item in value.items():
+                    self.walk(child, item, item_key, inactive, hits)
+
+
 class SchemaValidator:
     """Main schema validation engine."""
 
-    def __init__(self, schema_dir: str = "../JSON-Schemas"):
+    def __init__(self, schema_dir: str = "../JSON-Schemas", error_mode: str = 'best', max_errors: int = 20,
+                 verify_detection: bool = False, rules_dir: Optional[str] = None, decoder: str = 'auto'):
+        if error_mode not in ERROR_MODES:
+            raise ValueError(f"Unknown error mode: {error_mode}")
+        if max_errors < 0:
+            # A negative cap would silently drop errors (-1) or crash islice (< -1)
+            raise ValueError(f"--max-errors must be 0 or greater, got {max_errors}")
+        self.decoder = resolve_decoder(decoder)
+        self.decode = JSON_DECODERS[self.decoder]
+        # Stats taken during discovery, reused for read sizing and manifest fingerprints
+        self.scanned: Dict[str, os.stat_result] = {}
+        self.pool: Optional[ProcessPoolExecutor] = None
         self.schema_dir = Path(schema_dir)
+        self.rules_dir = Path(rules_dir) if rules_dir else self.schema_dir.parent / QUALITY_RULES_DIR
+        self.error_mode = error_mode
+        self.max_errors = max_errors
+        self.verify_detection = verify_detection
         self.schemas: Dict[str, Dict] = {}
+        self.validators: Dict[str, Any] = {}
+        self.schema_errors: Dict[str, str] = {}
+        self.schema_hashes: Dict[str, str] = {}
+        # $ref registry over every schema and shared definition file, plus each
+        # resolved reference target keyed by absolute URI
+        self.registry = referencing.Registry()
+        self.schema_uris: Dict[str, str] = {}
+        # Every URI a schema file was reached by -> (its base URI, hash of its bytes)
+        self.uri_files: Dict[str, Tuple[str, str]] = {}
+        self.resolved_schemas: Dict[str, Any] = {}
+        self.resolved_refs: Dict[str, Any] = {}
+        self.ref_dependencies: Dict[str, set] = {}
+        self.schema_refs: Dict[str, set] = {}
+        # Detection index: top-level key -> schemas that require / define / constrain it
+        self.required_index: Dict[str, List[str]] = {}
+        self.property_index: Dict[str, List[str]] = {}
+        self.discriminator_index: Dict[str, List[Tuple[str, Any]]] = {}
+        self.closed_schemas: set = set()
+        # Hash of each schema's detection index entries, for manifest invalidation
+        self.detection_hashes: Dict[str, str] = {}
+        self.quality_engines: Dict[str, QualityRuleEngine] = {}
         self.load_schemas()
+        self.load_quality_rules()
 
     def load_schemas(self) -> None:
-        """Load all JSON schemas from the schema directory."""
+        """Load all JSON schemas, register them for $ref resolution and compile their validators.
+
+        Top-level *.json files are validation targets. Files under shared/ (for
+        example shared/definitions.json) are only registered, so schemas can
+        $ref their definitions without being offered for detection themselves.
+        """
         if not self.schema_dir.exists():
             logger.warning(f"Schema directory {self.schema_dir} does not exist")
             return
 
-        for schema_file in self.schema_dir.glob("*.json"):
+        resources = []
+        schema_files = [(p.stem, p) for p in sorted(self.schema_dir.glob("*.json"))]
+        shared_dir = self.schema_dir / SHARED_SCHEMA_DIR
+        shared_files = [(f"{SHARED_SCHEMA_DIR}/{p.stem}", p) for p in sorted(shared_dir.glob("*.json"))]
+        for schema_name, schema_file in schema_files + shared_files:
             try:
-                with open(schema_file, 'r', encoding='utf-8') as f:
-                    schema = json.load(f)
-                    schema_name = schema_file.stem
-                    self.schemas[schema_name] = schema
-                    logger.info(f"Loaded schema: {schema_name}")
+                with open(schema_file, 'rb') as f:
+                    raw = f.read()
+                schema = json.loads(raw)
             except Exception as e:
                 logger.error(f"Failed to load schema {schema_file}: {e}")
+                continue
+            base_uri = self.base_uri(schema_file, schema)
+            self.schema_uris[schema_name] = base_uri
+            file_entry = (base_uri, hashlib.sha256(raw).hexdigest())
+            resource = referencing.Resource.from_contents(schema, default_specification=DRAFT202012)
+            # Reachable by $id and by file path, so relative and absolute refs both work
+            for uri in {base_uri, schema_file.resolve().as_uri(), schema_file.relative_to(self.schema_dir).as_posix()}:
+                resources.append((uri, resource))
+                self.uri_files[uri] = file_entry
+            if schema_file.parent == self.schema_dir:
+                self.schemas[schema_name] = schema
+        self.registry = referencing.Registry(retrieve=self.retrieve_local).with_resources(resources).crawl()
+
+        for schema_name, schema in self.schemas.items():
+            self.compile_schema(schema_name, schema)
+            # A schema's hash covers every file its references reached, so editing
+            # a shared definition invalidates exactly the schemas that use it
+            used = sorted(self.schema_refs.get(schema_name, set()) | {self.schema_uris[schema_name]})
+            self.schema_hashes[schema_name] = hashlib.sha256(
+                ''.join(self.uri_files[uri][1] if uri in self.uri_files else uri for uri in used).encode()
+            ).hexdigest()
+            logger.info(f"Loaded schema: {schema_name}")
+
+        self.build_detection_index()
+
+    def base_uri(self, schema_file: Path, schema: Any) -> str:
+        """The URI a schema's relative references resolve against: its $id, else its path."""
+        file_uri = schema_file.resolve().as_uri()
+        if isinstance(schema, dict) and isinstance(schema.get('$id'), str):
+            return urldefrag(urljoin(file_uri, schema['$id'])).url
+        return file_uri
+
+    def retrieve_local(self, uri: str) -> 'referencing.Resource':
+        """Serve references to unregistered URIs from the schema directory, never the network.
+
+        A schema with an https $id can write {"$ref": "shared/definitions.json#/$defs/x"};
+        the joined URI is matched against local files by its trailing path segments.
+        """
+        parts = [part for part in urlsplit(uri).path.split('/') if part]
+        for i in range(len(parts)):
+            candidate = self.schema_dir.joinpath(*parts[i:])
+            if candidate.is_file() and self.schema_dir.resolve() in candidate.resolve().parents:
+                with open(candidate, 'rb') as f:
+                    raw = f.read()
+                contents = json.loads(raw)
+                # Hash the file under the URI it was asked for, so schema hashes track its edits
+                file_entry = (self.base_uri(candidate, contents), hashlib.sha256(raw).hexdigest())
+                self.uri_files[uri] = self.uri_files[file_entry[0]] = file_entry
+                return referencing.Resource.from_contents(contents, default_specification=DRAFT202012)
+        raise referencing.exceptions.NoSuchResource(ref=uri)
+
+    def inline_refs(self, node: Any, base_uri: str, stack: Tuple[str, ...], used: set) -> Any:
+        """Return node with its $refs replaced by the (cached) schemas they point to.
+
+        Each target is resolved once per validator instance and the same inlined
+        object is shared by every schema that refers to it. Recursive references,
+        and $refs with sibling keywords that constrain the instance, stay as $refs
+        rewritten to absolute URIs so they still resolve correctly at validation
+        time through the registry.
+        """
+        if isinstance(node, list):
+            return [self.inline_refs(item, base_uri, stack, used) for item in node]
+        if not isinstance(node, dict):
+            return node
+        if isinstance(node.get('$id'), str):
+            base_uri = urldefrag(urljoin(base_uri, node['$id'])).url
+
+        ref = node.get('$ref')
+        if not isinstance(ref, str):
+            return self.inline_keywords(node, base_uri, stack, used)
+
+        target = urljoin(base_uri, ref)
+        used.add(urldefrag(target).url)
+        siblings = {key: value for key, value in node.items() if key != '$ref'}
+        if target in stack or not set(siblings) <= ANNOTATION_KEYWORDS:
+            return {'$ref': target, **self.inline_keywords(siblings, base_uri, stack, used)}
+
+        if target not in self.resolved_refs:
+            target_used: set = set()
+            contents = self.registry.resolver().lookup(target).contents
+            self.resolved_refs[target] = self.inline_refs(contents, urldefrag(target).url,
+                                                          stack + (target,), target_used)
+            self.ref_dependencies[target] = target_used
+        used |= self.ref_dependencies[target]
+        resolved = self.resolved_refs[target]
+        # Annotations next to a $ref (description, title, ...) do not affect validation
+        return {**resolved, **siblings} if siblings and isinstance(resolved, dict) else resolved
+
+    def inline_keywords(self, node: Dict, base_uri: str, stack: Tuple[str, ...], used: set) -> Dict:
+        inlined = {}
+        for key, value in node.items():
+            if key in NON_SCHEMA_KEYWORDS:
+                inlined[key] = value
+            elif key in SCHEMA_MAP_KEYWORDS and isinstance(value, dict):
+                inlined[key] = {name: self.inline_refs(subschema, base_uri, stack, used)
+                                for name, subschema in value.items()}
+            else:
+                inlined[key] = self.inline_refs(value, base_uri, stack, used)
+        return inlined
+
+    def load_quality_rules(self) -> None:
+        """Compile each schema's quality rules, followed by the common rules, into one engine.
+
+        Rules live in <rules_dir>/<schema>.json and <rules_dir>/common.json as
+        {"rules": [{"path", "predicate", "penalty", "message", ...}]}. A file that
+        fails to load or compile is logged and skipped. Each schema's hash is
+        extended with its own rules and the common rules, so editing one rules file
+        only invalidates manifest entries for the schemas it applies to.
+        """
+        rule_specs: Dict[str, List[Dict[str, Any]]] = {}
+        rule_raw: Dict[str, bytes] = {}
+        rules_files = []
+        if self.rules_dir.is_dir():
+            rules_files = sorted(self.rules_dir.glob("*.json"))
+        else:
+            logger.warning(f"Quality rules directory {self.rules_dir} does not exist; no quality rules applied")
+        for rules_file in rules_files:
+            try:
+                with open(rules_file, 'rb') as f:
+                    raw = f.read()
+                specs = json.loads(raw)['rules']
+                for i, spec in enumerate(specs):
+                    try:
+                        QualityRule.from_spec(i, spec)
+                    except (KeyError, TypeError, ValueError) as e:
+                        raise ValueError(f"rule {i}: {e!r}") from e
+            except Exception as e:
+                logger.error(f"Failed to load quality rules {rules_file}: {e}")
+                continue
+            rule_specs[rules_file.stem] = specs
+            rule_raw[rules_file.stem] = raw
+
+        for schema_name in self.schemas:
+            specs = rule_specs.get(schema_name, []) + rule_specs.get(COMMON_RULES, [])
+            self.quality_engines[schema_name] = QualityRuleEngine(
+                [QualityRule.from_spec(i, spec) for i, spec in enumerate(specs)])
+            digest = hashlib.sha256(self.schema_hashes[schema_name].encode())
+            for stem in (schema_name, COMMON_RULES):
+                if stem in rule_raw:
+                    digest.update(b'\0' + stem.encode() + b'\0' + rule_raw[stem])
+            self.schema_hashes[schema_name] = digest.hexdigest()
+
+    def build_detection_index(self) -> None:
+        """Index each schema's required keys, properties and const/enum discriminators.
+
+        detect_schema_type() then ranks schemas with one dictionary lookup per
+        top-level key of the document instead of testing every schema.
+        """
+        for schema_name in sorted(self.schemas):
+            schema = self.resolved_schemas.get(schema_name, self.schemas[schema_name])
+            properties = schema.get('properties', {}) if isinstance(schema.get('properties'), dict) else {}
+            required = schema.get('required', [])
+            for key in required:
+                self.required_index.setdefault(key, []).append(schema_name)
+            for key, definition in properties.items():
+                self.property_index.setdefault(key, []).append(schema_name)
+                if not isinstance(definition, dict):
+                    continue
+                if 'const' in definition:
+                    allowed = [definition['const']]
+                elif 'enum' in definition:
+                    allowed = definition['enum']
+                else:
+                    continue
+                self.discriminator_index.setdefault(key, []).append((schema_name, allowed))
+            if schema.get('additionalProperties') is False:
+                self.closed_schemas.add(schema_name)
+            signature = [sorted(required), sorted(properties), schema.get('additionalProperties') is False,
+                         {k: properties[k].get('const', properties[k].get('enum'))
+                          for k in properties if isinstance(properties[k], dict)}]
+            self.detection_hashes[schema_name] = hashlib.sha256(
+                json.dumps(signature, sort_keys=True, default=str).encode()).hexdigest()
+
+    def detection_inputs_hash(self, keys: Iterable[str]) -> str:
+        """Hash of the detection index entries a document with these top-level keys can hit.
+
+        Only schemas that require, define or constrain one of the keys can rank
+        the document, so editing any other schema leaves the hash unchanged. With
+        verify_detection the candidates' full hashes count, since detection
+        validates the document against them.
+        """
+        touched = set()
+        for key in keys:
+            touched.update(self.required_index.get(key, ()))
+            touched.update(self.property_index.get(key, ()))
+            touched.update(schema_name for schema_name, _ in self.discriminator_index.get(key, ()))
+        hashes = self.schema_hashes if self.verify_detection else self.detection_hashes
+        return hashlib.sha256(
+            json.dumps([[name, hashes[name]] for name in sorted(touched)]).encode()).hexdigest()
+
+    def rank_schemas(self, data: Dict) -> List[str]:
+        """Schemas that plausibly describe data, best match first.
+
+        Ranking, in order: no violated const/enum discriminators; most required
+        keys and discriminators matched; most known properties, minus keys a
+        closed schema (additionalProperties: false) would reject.
+        """
+        required_hits: Dict[str, int] = {}
+        property_hits: Dict[str, int] = {}
+        discriminator_hits: Dict[str, int] = {}
+        discriminator_misses: Dict[str, int] = {}
+        for key in data:
+            for schema_name in self.required_index.get(key, ()):
+                required_hits[schema_name] = required_hits.get(schema_name, 0) + 1
+            for schema_name in self.property_index.get(key, ()):
+                property_hits[schema_name] = property_hits.get(schema_name, 0) + 1
+            for schema_name, allowed in self.discriminator_index.get(key, ()):
+                if data[key] in allowed:
+                    discriminator_hits[schema_name] = discriminator_hits.get(schema_name, 0) + 1
+                else:
+                    discriminator_misses[schema_name] = discriminator_misses.get(schema_name, 0) + 1
+
+        def rank(schema_name: str) -> Tuple[int, int, int]:
+            known = property_hits.get(schema_name, 0)
+            unknown = len(data) - known if schema_name in self.closed_schemas else 0
+            return (
+                -discriminator_misses.get(schema_name, 0),
+                required_hits.get(schema_name, 0) + discriminator_hits.get(schema_name, 0),
+                known - unknown
+            )
+
+        return sorted(property_hits, key=lambda name: (rank(name), name), reverse=True)
+
+    def compile_schema(self, schema_name: str, schema: Dict) -> None:
+        """Check a schema once and build a reusable validator for it.
+
+        jsonschema.validate() re-runs check_schema and constructs a new validator on
+        every call; building it here means validate_file only pays for validation.
+        The validator is built from the schema with its references already inlined,
+        so validation does no $ref lookups except for recursive references.
+        """
+        validator_cls = jsonschema.validators.validator_for(schema)
+        try:
+            validator_cls.check_schema(schema)
+        except jsonschema.SchemaError as e:
+            self.schema_errors[schema_name] = e.message
+            logger.error(f"Invalid schema {schema_name}: {e.message}")
+            return
+        used: set = set()
+        try:
+            resolved = self.inline_refs(schema, self.schema_uris[schema_name], (), used)
+        except referencing.exceptions.Unresolvable as e:
+            self.schema_errors[schema_name] = f"Unresolvable reference: {e}"
+            logger.error(f"Invalid schema {schema_name}: unresolvable reference {e}")
+            return
+        self.resolved_schemas[schema_name] = resolved
+        # Keyed by each file's base URI, however the reference spelled it
+        self.schema_refs[schema_name] = {self.uri_files[uri][0] if uri in self.uri_files else uri for uri in used}
+        format_checker = getattr(validator_cls, 'FORMAT_CHECKER', None) or jsonschema.FormatChecker()
+        self.validators[schema_name] = validator_cls(resolved, registry=self.registry, format_checker=format_checker)
 
     def detect_schema_type(self, data: Dict) -> Optional[str]:
-        """Auto-detect the appropriate schema based on data content."""
-        # Schema detection logic based on data structure
-        if 'image_metadata' in data and 'quality_assessment' in data:
-            return 'image-analysis'
-        elif 'stream_metadata' in data and 'data_schema' in data:
-            return 'streaming-data'
-        elif 'message_id' in data and 'sender_agent' in data:
-            return 'agent-communication'
-        elif 'findings' in data and 'hypothesis' in data:
-            return 'research-analysis'
-        else:
-            return 'research-analysis'  # Default fallback
+        """Auto-detect the appropriate schema based on data content.
+
+        Uses the detection index built at load time. With verify_detection, ranked
+        candidates are validated in order and the first one the document passes
+        wins; otherwise (or if none pass) the top-ranked schema is used.
+        """
+        ranked = self.rank_schemas(data)
+        if not ranked:
+            return DEFAULT_SCHEMA  # Default fallback
+
+        if self.verify_detection:
+            for schema_name in ranked:
+                validator = self.validators.get(schema_name)
+                if validator is not None and validator.is_valid(data):
+                    return schema_name
+        return ranked[0]
+
+    def load_failure(self, source: str, schema_name: Optional[str], error: Exception,
+                     metadata: Optional[Dict[str, Any]] = None) -> ValidationResult:
+        """Result for a document that could not be read or decoded."""
+        return ValidationResult(
+            file_path=source,
+            schema_name=schema_name or 'unknown',
+            is_valid=False,
+            errors=[f"Failed to load JSON: {error}"],
+            warnings=[],
+            score=0.0,
+            metadata=metadata or {}
+        )
+
+    def validate_file(self, file_path: str, schema_name: Optional[str] = None,
+                      size_hint: Optional[int] = None) -> ValidationResult:
+        """Validate a single JSON file against a schema.
 
-    def validate_file(self, file_path: str, schema_name: Optional[str] = None) -> ValidationResult:
-        """Validate a single JSON file against a schema."""
+        size_hint is the file size from an earlier stat, normally the one taken by
+        collect_files; it only sizes the read buffer.
+        """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data, size = read_document(file_path, self.decode, size_hint)
         except Exception as e:
-            return ValidationResult(
-                file_path=file_path,
-                schema_name=schema_name or 'unknown',
-                is_valid=False,
-                errors=[f"Failed to load JSON: {e}"],
-                warnings=[],
-                score=0.0,
-                metadata={}
-            )
+            return self.load_failure(file_path, schema_name, e)
+
+        return self.validate_data(data, file_path, schema_name, {'file_size': size})
+
+    def validate_jsonl(self, file_path: str, schema_name: Optional[str] = None) -> Iterator[ValidationResult]:
+        """Validate a JSONL/NDJSON file one record at a time.
 
+        Only one line is held in memory at a time. Results are labelled
+        "path:line" and carry the line number in their metadata.
+        """
+        line_no = 0
+        try:
+            with open(file_path, 'rb') as f:
+                for line_no, line in enumerate(f, 1):
+                    if not line.strip():
+                        continue
+                    source = f"{file_path}:{line_no}"
+                    metadata = {'line': line_no, 'file_size': len(line)}
+                    try:
+                        data = self.decode(line)
+                    except ValueError as e:
+                        yield self.load_failure(source, schema_name, e, metadata)
+                        continue
+                    yield self.validate_data(data, source, schema_name, metadata)
+        except OSError as e:
+            # A missing or unreadable file is one failed result, like a missing .json file
+            source = f"{file_path}:{line_no}" if line_no else file_path
+            yield self.load_failure(source, schema_name, e, {'line': line_no} if line_no else {})
+
+    def validate_json_array(self, file_path: str, schema_name: Optional[str] = None) -> Iterator[ValidationResult]:
+        """Validate each element of a top-level JSON array without loading the whole file."""
+        index = 0
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                for data in iter_json_array(f):
+                    yield self.validate_data(data, f"{file_path}[{index}]", schema_name, {'index': index})
+                    index += 1
+        except (OSError, ValueError) as e:
+            yield self.load_failure(f"{file_path}[{index}]", schema_name, e, {'index': index})
+
+    def validate_path(self, file_path: str, array: bool = False) -> Iterator[ValidationResult]:
+        """Validate a file, streaming record by record for JSONL files (and arrays if asked)."""
+        if file_path.lower().endswith(JSONL_SUFFIXES):
+            yield from self.validate_jsonl(file_path)
+        elif array:
+            yield from self.validate_json_array(file_path)
+        else:
+            yield self.validate_file(file_path)
+
+    def validate_data(self, data: Any, source: str, schema_name: Optional[str] = None,
+                      metadata: Optional[Dict[str, Any]] = None) -> ValidationResult:
+        """Validate an already decoded document; source labels it in the result."""
         # Auto-detect schema if not provided
         if not schema_name:
-            schema_name = self.detect_schema_type(data)
+            schema_name = self.detect_schema_type(data) if isinstance(data, dict) else 'unknown'
 
         # Get the appropriate schema
         schema = self.schemas.get(schema_name)
         if not schema:
             return ValidationResult(
-                file_path=file_path,
+                file_path=source,
                 schema_name=schema_name,
                 is_valid=False,
                 errors=[f"Schema '{schema_name}' not found"],
                 warnings=[],
                 score=0.0,
-                metadata={}
+                metadata={
+                    **(metadata or {}),
+                    'data_keys': list(data.keys()) if isinstance(data, dict) else []
+                }
             )
 
         # Perform validation
@@ -146,171 +927,399 @@ class SchemaValidator:
         warnings = []
         score = 100.0
 
-        try:
-            jsonschema.validate(data, schema)
-            logger.info(f"✅ {file_path} validates against {schema_name}")
-        except jsonschema.ValidationError as e:
-            errors.append(f"Schema validation error: {e.message}")
-            score -= 50  # Major penalty for schema errors
-        except jsonschema.SchemaError as e:
-            errors.append(f"Schema error: {e.message}")
+        validator = self.validators.get(schema_name)
+        if validator is None:
+            errors.append(f"Schema error: {self.schema_errors.get(schema_name, 'validator unavailable')}")
             score = 0
+        else:
+            errors = self.schema_validation_errors(validator, data)
+            if not errors:
+                logger.info(f"✅ {source} validates against {schema_name}")
+            else:
+                score -= 50  # Major penalty for schema errors
+
+        if self.error_mode == 'fast':
+            # Gating only needs the verdict; skip quality checks and metadata
+            return ValidationResult(
+                file_path=source,
+                schema_name=schema_name,
+                is_valid=len(errors) == 0,
+                errors=errors,
+                warnings=warnings,
+                score=max(0.0, score),
+                metadata=metadata or {}
+            )
 
         # Additional quality checks
-        score, additional_warnings = self.perform_quality_checks(data, schema_name)
+        penalty, additional_warnings = self.perform_quality_checks(data, schema_name)
+        score -= penalty
         warnings.extend(additional_warnings)
 
         # Calculate final score
         final_score = max(0.0, min(100.0, score))
 
         return ValidationResult(
-            file_path=file_path,
+            file_path=source,
             schema_name=schema_name,
             is_valid=len(errors) == 0,
             errors=errors,
             warnings=warnings,
             score=final_score,
             metadata={
-                'file_size': os.path.getsize(file_path),
+                **(metadata or {}),
                 'data_keys': list(data.keys()) if isinstance(data, dict) else [],
                 'schema_version': schema.get('$id', 'unknown')
             }
         )
 
-    def perform_quality_checks(self, data: Dict, schema_name: str) -> Tuple[float, List[str]]:
-        """Perform additional quality checks beyond basic schema validation."""
-        score_penalty = 0
-        warnings = []
-
-        # Schema-specific quality checks
-        if schema_name == 'image-analysis':
-            score_penalty, warnings = self.check_image_analysis_quality(data)
-        elif schema_name == 'streaming-data':
-            score_penalty, warnings = self.check_streaming_data_quality(data)
-        elif schema_name == 'agent-communication':
-            score_penalty, warnings = self.check_agent_communication_quality(data)
-        elif schema_name == 'research-analysis':
-            score_penalty, warnings = self.check_research_analysis_quality(data)
-
-        # General quality checks
-        if isinstance(data, dict):
-            # Check for empty required fields
-            for key, value in data.items():
-                if value is None or (isinstance(value, (list, str)) and len(value) == 0):
-                    warnings.append(f"Empty or null field: {key}")
-                    score_penalty += 5
-
-        return score_penalty, warnings
-
-    def check_image_analysis_quality(self, data: Dict) -> Tuple[float, List[str]]:
-        """Quality checks specific to image analysis results."""
-        penalty = 0
-        warnings = []
-
-        # Check confidence scores
-        if 'content_analysis' in data:
-            for element in data['content_analysis'].get('key_elements', []):
-                confidence = element.get('confidence', 0)
-                if confidence < 0.5:
-                    warnings.append(f"Low confidence score: {confidence} for element {element.get('element_type', 'unknown')}")
-                    penalty += 10
-
-        # Check for required medical fields in medical domain
-        if data.get('domain_specific_analysis', {}).get('domain') == 'medical':
-            findings = data.get('domain_specific_analysis', {}).get('findings', [])
-            if len(findings) == 0:
-                warnings.append("No findings recorded for medical image analysis")
-                penalty += 20
-
-        return penalty, warnings
-
-    def check_streaming_data_quality(self, data: Dict) -> Tuple[float, List[str]]:
-        """Quality checks specific to streaming data configurations."""
-        penalty = 0
-        warnings = []
-
-        # Check for monitoring configuration
-        if not data.get('monitoring_configuration', {}).get('metrics_collection', {}).get('enabled', False):
-            warnings.append("Metrics collection not enabled for streaming pipeline")
-            penalty += 15
-
-        # Check for alerting configuration
-        alert_rules = data.get('alerting_configuration', {}).get('alert_rules', [])
-        if len(alert_rules) == 0:
-            warnings.append("No alert rules configured for streaming pipeline")
-            penalty += 20
-
-        # Check for auto-scaling
-        if not data.get('scaling_configuration', {}).get('auto_scaling', {}).get('enabled', False):
-            warnings.append("Auto-scaling not enabled for streaming pipeline")
-            penalty += 10
-
-        return penalty, warnings
-
-    def check_agent_communication_quality(self, data: Dict) -> Tuple[float, List[str]]:
-        """Quality checks specific to agent communication."""
-        penalty = 0
-        warnings = []
-
-        # Check for response requirements
-        if data.get('requires_response', False):
-            if not data.get('response_deadline'):
-                warnings.append("Response required but no deadline specified")
-                penalty += 15
-
-        # Check message type validity
-        valid_types = [
-            "task_assignment", "progress_update", "result_delivery",
-            "error_report", "coordination_request", "status_check"
-        ]
-        if data.get('message_type') not in valid_types:
-            warnings.append(f"Invalid message type: {data.get('message_type')}")
-            penalty += 10
-
-        # Check for security context
-        if not data.get('security_context'):
-            warnings.append("No security context specified for agent communication")
-            penalty += 5
-
-        return penalty, warnings
-
-    def check_research_analysis_quality(self, data: Dict) -> Tuple[float, List[str]]:
-        """Quality checks specific to research analysis."""
-        penalty = 0
-        warnings = []
-
-        # Check for methodology section
-        if 'methodology' not in data:
-            warnings.append("Missing methodology section in research analysis")
-            penalty += 25
-
-        # Check for evidence citations
-        findings = data.get('findings', [])
-        uncited_findings = 0
-        for finding in findings:
-            if not finding.get('evidence') or len(finding.get('evidence', [])) == 0:
-                uncited_findings += 1
-
-        if uncited_findings > 0:
-            warnings.append(f"{uncited_findings} findings lack evidence citations")
-            penalty += uncited_findings * 5
-
-        return penalty, warnings
+    def schema_validation_errors(self, validator: Any, data: Any) -> List[str]:
+        """Validation error messages for data according to error_mode.
+
+        best: the single most relevant error, as jsonschema.validate() reports it.
+        all:  every error with its JSON Pointer, read lazily and capped at max_errors.
+        fast: stop at the first failure and report only that the document is invalid.
+        """
+        if self.error_mode == 'fast':
+            if validator.is_valid(data):
+                return []
+            return ["Schema validation failed"]
+
+        if self.error_mode == 'all':
+            found = list(islice(validator.iter_errors(data), self.max_errors + 1))
+            messages = [
+                f"Schema validation error at {json_pointer(error.absolute_path)}: {error.message}"
+                for error in found[:self.max_errors]
+            ]
+            if len(found) > self.max_errors:
+                messages.append(f"More than {self.max_errors} schema errors; remaining errors omitted")
+            return messages
+
+        error = jsonschema.exceptions.best_match(validator.iter_errors(data))
+        if error is None:
+            return []
+        return [f"Schema validation error: {error.message}"]
+
+    def perform_quality_checks(self, data: Any, schema_name: str) -> Tuple[float, List[str]]:
+        """Perform additional quality checks beyond basic schema validation.
+
+        Returns the penalty to subtract from the score and the warnings raised by
+        the schema's rules from the rules directory.
+        """
+        engine = self.quality_engines.get(schema_name)
+        if engine is None:
+            return 0.0, []
+        return engine.evaluate(data)
+
+    def discover(self, patterns: Iterable[str], include: Iterable[str] = (),
+                 exclude: Iterable[str] = ()) -> Iterator[Tuple[str, Optional[os.stat_result]]]:
+        """Yield (path, stat) for every file the patterns name.
+
+        A regular file is yielded as given, whatever its suffix. A directory is
+        walked recursively with os.scandir, in name order, yielding files with a
+        validated suffix. A glob pattern (** recurses) is expanded and its matches
+        handled the same way. Include/exclude globs filter the files found by
+        walking and globbing, matched against the path relative to the directory
+        walked and against the file name; excluded directories are not entered,
+        and neither are hidden, __pycache__ or node_modules directories. A path
+        that does not exist is yielded with a None stat so validation reports it.
+        Each path is yielded once, however many patterns name it.
+        """
+        include_match = compile_globs(include)
+        exclude_match = compile_globs(exclude)
+        # Overlapping patterns (a directory and a glob inside it, or the directories
+        # a ** glob also matches) must not yield a file twice
+        seen = set()
+
+        def unseen(path: str) -> bool:
+            key = os.path.normcase(os.path.abspath(path))
+            if key in seen:
+                return False
+            seen.add(key)
+            return True
+
+        for pattern in patterns:
+            try:
+                st = os.stat(pattern)
+            except OSError:
+                st = None
+            if st is not None and stat.S_ISREG(st.st_mode):
+                if unseen(pattern):
+                    yield pattern, st
+            elif st is not None and stat.S_ISDIR(st.st_mode):
+                for path, path_st in self.scan_directory(pattern, include_match, exclude_match):
+                    if unseen(path):
+                        yield path, path_st
+            elif glob.has_magic(pattern):
+                recursive = '**' in pattern
+                for match in glob.iglob(pattern, recursive=True):
+                    if os.path.isdir(match):
+                        # A ** pattern also matches every file below the directory
+                        if not recursive:
+                            for path, path_st in self.scan_directory(match, include_match, exclude_match):
+                                if unseen(path):
+                                    yield path, path_st
+                        continue
+                    if not match.lower().endswith(VALIDATED_SUFFIXES) or not self.wanted(
+                            match, os.path.basename(match), include_match, exclude_match):
+                        continue
+                    try:
+                        st = os.stat(match)
+                    except OSError:
+                        continue
+                    if stat.S_ISREG(st.st_mode) and unseen(match):
+                        yield match, st
+            elif unseen(pattern):
+                yield pattern, None
+
+    @staticmethod
+    def wanted(rel_path: str, name: str, include_match, exclude_match) -> bool:
+        if exclude_match is not None and (exclude_match(rel_path) or exclude_match(name)):
+            return False
+        return include_match is None or bool(include_match(rel_path) or include_match(name))
+
+    def scan_directory(self, root: str, include_match=None, exclude_match=None
+                       ) -> Iterator[Tuple[str, os.stat_result]]:
+        """Walk root depth-first with os.scandir, yielding validated files and their stats.
+
+        Files in a directory come before its subdirectories, both in name order.
+        Symlinked directories are not followed.
+        """
+        prefix = '' if os.path.normpath(root) == '.' else root
+        stack = [(prefix, '')]
+        while stack:
+            directory, rel_dir = stack.pop()
+            try:
+                with os.scandir(directory or '.') as it:
+                    entries = sorted(it, key=lambda entry: entry.name)
+            except OSError as e:
+                logger.warning(f"Cannot scan {directory or '.'}: {e}")
+                continue
+            subdirs = []
+            for entry in entries:
+                path = os.path.join(directory, entry.name) if directory else entry.name
+                rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if (entry.name.startswith('.') or entry.name in SKIPPED_DIRS
+                                or (exclude_match is not None and (exclude_match(rel_path) or exclude_match(entry.name)))):
+                            continue
+                        subdirs.append((path, rel_path))
+                    elif (entry.name.lower().endswith(VALIDATED_SUFFIXES) and entry.is_file()
+                          and self.wanted(rel_path, entry.name, include_match, exclude_match)):
+                        yield path, entry.stat()
+                except OSError:
+                    continue
+            stack.extend(reversed(subdirs))
+
+    def iter_files(self, patterns: Iterable[str], include: Iterable[str] = (),
+                   exclude: Iterable[str] = ()) -> Iterator[str]:
+        """Discover files in a background thread and yield them as they are found.
+
+        Discovery runs ahead of validation through a bounded queue, so walking a
+        large tree overlaps with validating what has already been found. Each
+        file's stat is kept in self.scanned for reading and manifest lookups.
+        """
+        found: queue.Queue = queue.Queue(maxsize=DISCOVERY_QUEUE_SIZE)
+        stop = threading.Event()
+
+        def put(item: Any) -> bool:
+            while not stop.is_set():
+                try:
+                    found.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce() -> None:
+            try:
+                for item in self.discover(patterns, include, exclude):
+                    if not put(item):
+                        return
+            except Exception as e:
+                put(e)
+            finally:
+                put(None)
 
-    def batch_validate(self, file_patterns: List[str]) -> ValidationReport:
+        producer = threading.Thread(target=produce, name='schema-validator-discovery', daemon=True)
+        producer.start()
+        try:
+            while True:
+                item = found.get()
+                if item is None:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                file_path, st = item
+                if st is not None:
+                    self.scanned[file_path] = st
+                yield file_path
+        finally:
+            stop.set()
+
+    def collect_files(self, file_patterns: List[str], include: Iterable[str] = (),
+                      exclude: Iterable[str] = ()) -> List[str]:
+        """Expand files, directories and glob patterns into a list of JSON files.
+
+        Each file is stat'ed once here and the result kept in self.scanned, so
+        reading and manifest lookups do not stat it again.
+        """
+        files = []
+        for file_path, st in self.discover(file_patterns, include, exclude):
+            files.append(file_path)
+            if st is not None:
+                self.scanned[file_path] = st
+        return files
+
+    def worker_pool(self, jobs: int) -> ProcessPoolExecutor:
+        """The process pool for fan-out, created on first use.
+
+        Each worker loads and compiles the schemas once in _init_worker.
+        """
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(
+                max_workers=jobs,
+                initializer=_init_worker,
+                initargs=(str(self.schema_dir), logger.level, self.error_mode, self.max_errors,
+                          self.verify_detection, str(self.rules_dir), self.decoder)
+            )
+        return self.pool
+
+    def close_pool(self) -> None:
+        if self.pool is not None:
+            self.pool.shutdown(wait=True, cancel_futures=True)
+            self.pool = None
+
+    def validate_many(self, file_paths: Iterable[str], jobs: int = 1, array: bool = False,
+                      manifest: Optional['ValidationManifest'] = None) -> Iterator[ValidationResult]:
+        """Validate files, yielding results in input order.
+
+        file_paths may be a lazy iterable such as iter_files(); plain JSON files
+        are validated in runs of up to VALIDATION_RUN_SIZE as they arrive. With
+        jobs > 1, runs are split into chunks and fanned out to worker processes,
+        and chunk results are yielded in order as soon as they are ready. Streamed
+        files (JSONL, or arrays with array=True) are read in this process so their
+        records never have to be buffered. With a manifest, plain JSON files whose
+        content and schema are unchanged reuse their previous result. A pool that
+        already exists (see watch) is left running; one created here is shut down.
+        """
+        owns_pool = self.pool is None
+
+        def get_pool() -> ProcessPoolExecutor:
+            return self.worker_pool(jobs)
+
+        pending: List[str] = []
+        try:
+            for file_path in chain(file_paths, [None]):
+                streamed = file_path is None or self.is_streamed(file_path, array)
+                if not streamed:
+                    pending.append(file_path)
+                if pending and (streamed or len(pending) >= VALIDATION_RUN_SIZE):
+                    yield from self.validate_run(pending, jobs, get_pool, manifest)
+                    pending = []
+
+                if file_path is not None and streamed:
+                    self.scanned.pop(file_path, None)
+                    yield from self.validate_path(file_path, array)
+        finally:
+            if owns_pool:
+                self.close_pool()
+            if manifest is not None:
+                manifest.flush()
+
+    def validate_run(self, file_paths: List[str], jobs: int, get_pool,
+                     manifest: Optional['ValidationManifest'] = None) -> Iterator[ValidationResult]:
+        """Validate a run of plain JSON files, skipping manifest hits, in input order."""
+        stats = [self.scanned.pop(file_path, None) for file_path in file_paths]
+        reused: Dict[int, ValidationResult] = {}
+        fingerprints: Dict[int, Optional[Tuple[int, int, str]]] = {}
+        if manifest is not None:
+            for i, file_path in enumerate(file_paths):
+                result, fingerprint = manifest.lookup(file_path, self, stats[i])
+                if result is not None:
+                    reused[i] = result
+                else:
+                    fingerprints[i] = fingerprint
+
+        misses = [(file_path, stats[i].st_size if stats[i] is not None else None)
+                  for i, file_path in enumerate(file_paths) if i not in reused]
+        if jobs > 1 and len(misses) > 1:
+            chunk_size = max(1, min(256, len(misses) // (jobs * 4)))
+            chunks = [misses[i:i + chunk_size] for i in range(0, len(misses), chunk_size)]
+            fresh = chain.from_iterable(get_pool().map(_validate_chunk, chunks))
+        else:
+            fresh = (self.validate_file(file_path, size_hint=size) for file_path, size in misses)
+
+        for i, file_path in enumerate(file_paths):
+            if i in reused:
+                yield reused[i]
+                continue
+            result = next(fresh)
+            if manifest is not None:
+                manifest.record(file_path, fingerprints[i], result, self)
+            yield result
+
+    def watch(self, patterns: List[str], include: Iterable[str] = (), exclude: Iterable[str] = (),
+              interval: float = 2.0, jobs: int = 1, array: bool = False,
+              manifest: Optional['ValidationManifest'] = None,
+              on_cycle: Optional[Callable[[], None]] = None) -> Iterator[ValidationResult]:
+        """Poll the patterns forever, validating files that are new or have changed.
+
+        Every file is validated on the first scan. After that the tree is rescanned
+        every interval seconds and a file whose (size, mtime) changed is validated
+        once it has stayed the same for one interval, so files still being written
+        are not reported half-finished. on_cycle runs after each scan that produced
+        results. The worker pool, if any, is kept for the whole session.
+        """
+        settled: Dict[str, Tuple[int, int]] = {}
+        changing: Dict[str, Tuple[int, int]] = {}
+        first = True
+        if jobs > 1:
+            self.worker_pool(jobs)
+        try:
+            while True:
+                ready: List[str] = []
+                current: Dict[str, Tuple[int, int]] = {}
+                for file_path, st in self.discover(patterns, include, exclude):
+                    if st is None:
+                        continue
+                    signature = (st.st_size, st.st_mtime_ns)
+                    current[file_path] = signature
+                    if settled.get(file_path) == signature:
+                        continue
+                    if first or changing.get(file_path) == signature:
+                        ready.append(file_path)
+                        self.scanned[file_path] = st
+                        settled[file_path] = signature
+                    else:
+                        changing[file_path] = signature
+                # Forget deleted files so they are revalidated if they come back
+                settled = {path: sig for path, sig in settled.items() if path in current}
+                changing = {path: sig for path, sig in changing.items()
+                            if path in current and settled.get(path) != sig}
+                first = False
+                if ready:
+                    yield from self.validate_many(ready, jobs, array, manifest)
+                    if on_cycle is not None:
+                        on_cycle()
+                time.sleep(interval)
+        finally:
+            self.close_pool()
+
+    @staticmethod
+    def is_streamed(file_path: str, array: bool = False) -> bool:
+        return array or file_path.lower().endswith(JSONL_SUFFIXES)
+
+    def batch_validate(self, file_patterns: List[str], jobs: int = 1, array: bool = False,
+                       manifest: Optional['ValidationManifest'] = None, include: Iterable[str] = (),
+                       exclude: Iterable[str] = ()) -> ValidationReport:
         """Validate multiple files in batch mode."""
-        results = []
-
-        for pattern in file_patterns:
-            path = Path(pattern)
-            if path.is_file():
-                result = self.validate_file(str(path))
-                results.append(result)
-            elif path.is_dir() or '*' in pattern:
-                for file_path in Path('.').glob(pattern):
-                    if file_path.is_file() and file_path.suffix == '.json':
-                        result = self.validate_file(str(file_path))
-                        results.append(result)
+        return self.build_report(self.validate_many(self.iter_files(file_patterns, include, exclude),
+                                                    jobs, array, manifest))
+
+    def build_report(self, results: Iterable[ValidationResult]) -> ValidationReport:
+        """Collect results into a ValidationReport with summary statistics."""
+        results = list(results)
 
         # Generate summary
         total_files = len(results)
@@ -338,133 +1347,480 @@ class SchemaValidator:
 
     def generate_html_report(self, report: ValidationReport) -> str:
         """Generate an HTML report from validation results."""
-        html = f"""
-<!DOCTYPE html>
+        out = io.StringIO()
+        writer = HtmlReportWriter(out, report.timestamp)
+        for result in report.results:
+            writer.write(result)
+        writer.close()
+        return out.getvalue()
+
+
+class ReportWriter:
+    """Incremental report output.
+
+    Results are written as they arrive and only running totals are kept, so
+    memory stays constant however many results a run produces. Output is
+    flushed after the first result and then at most every FLUSH_INTERVAL
+    seconds, so a consumer sees progress immediately without paying for a
+    flush per line.
+    """
+
+    FLUSH_INTERVAL = 0.5
+
+    def __init__(self, out: TextIO, timestamp: Optional[datetime] = None):
+        self.out = out
+        self.timestamp = timestamp or datetime.now()
+        self.total = 0
+        self.valid = 0
+        self.score_sum = 0.0
+        self.last_flush = 0.0
+        self.begin()
+        self.flush()
+
+    @property
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'total_files': self.total,
+            'valid_files': self.valid,
+            'invalid_files': self.total - self.valid,
+            'average_score': round(self.score_sum / self.total, 2) if self.total else 0,
+            'validation_rate': round(self.valid / self.total * 100, 2) if self.total else 0,
+        }
+
+    def write(self, result: ValidationResult) -> None:
+        self.total += 1
+        self.valid += result.is_valid
+        self.score_sum += result.score
+        self.write_result(result)
+        if self.total == 1 or time.monotonic() - self.last_flush >= self.FLUSH_INTERVAL:
+            self.flush()
+
+    def close(self) -> None:
+        self.end()
+        self.flush()
+
+    def flush(self) -> None:
+        self.out.flush()
+        self.last_flush = time.monotonic()
+
+    def begin(self) -> None:
+        pass
+
+    def write_result(self, result: ValidationResult) -> None:
+        raise NotImplementedError
+
+    def end(self) -> None:
+        pass
+
+
+class TextReportWriter(ReportWriter):
+    """Human-readable console output."""
+
+    def begin(self) -> None:
+        self.out.write(f"Validation Report - {self.timestamp.strftime('%Y-%m-%d %H:%M:%S')}\n")
+
+    def write_result(self, result: ValidationResult) -> None:
+        status = "✅" if result.is_valid else "❌"
+        lines = [f"{status} {result.file_path} (Score: {result.score}%)"]
+        lines.extend(f"   Error: {error}" for error in result.errors)
+        lines.extend(f"   Warning: {warning}" for warning in result.warnings)
+        self.out.write('\n'.join(lines) + '\n')
+
+    def end(self) -> None:
+        summary = self.summary
+        self.out.write(
+            f"Total Files: {summary['total_files']}\n"
+            f"Valid: {summary['valid_files']}\n"
+            f"Invalid: {summary['invalid_files']}\n"
+            f"Average Score: {summary['average_score']:.2f}%\n"
+            f"Validation Rate: {summary['validation_rate']:.2f}%\n"
+        )
+
+
+class HtmlReportWriter(ReportWriter):
+    """HTML page with one collapsible entry per result and the summary at the end.
+
+    Invalid results are expanded by default. All file names, schema names,
+    errors and warnings are HTML-escaped.
+    """
+
+    HEAD = """<!DOCTYPE html>
 <html>
 <head>
+    <meta charset="utf-8">
     <title>Schema Validation Report</title>
     <style>
-        body {{ font-family: Arial, sans-serif; margin: 40px; }}
-        .summary {{ background: #f0f0f0; padding: 20px; border-radius: 5px; margin-bottom: 20px; }}
-        .result {{ margin-bottom: 10px; padding: 10px; border: 1px solid #ddd; }}
-        .valid {{ background: #d4edda; border-color: #c3e6cb; }}
-        .invalid {{ background: #f8d7da; border-color: #f5c6cb; }}
-        .errors {{ color: #721c24; }}
-        .warnings {{ color: #856404; }}
-        .score {{ font-weight: bold; }}
-        table {{ border-collapse: collapse; width: 100%; }}
-        th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
-        th {{ background-color: #f2f2f2; }}
+        body { font-family: Arial, sans-serif; margin: 40px; }
+        .summary { background: #f0f0f0; padding: 20px; border-radius: 5px; margin-top: 20px; }
+        .result { margin-bottom: 10px; padding: 10px; border: 1px solid #ddd; }
+        .result summary { cursor: pointer; }
+        .valid { background: #d4edda; border-color: #c3e6cb; }
+        .invalid { background: #f8d7da; border-color: #f5c6cb; }
+        .errors { color: #721c24; }
+        .warnings { color: #856404; }
+        .score { font-weight: bold; }
     </style>
 </head>
 <body>
     <h1>Schema Validation Report</h1>
-    <div class="summary">
-        <h2>Summary</h2>
-        <p><strong>Generated:</strong> {report.timestamp.strftime('%Y-%m-%d %H:%M:%S')}</p>
-        <p><strong>Total Files:</strong> {report.total_files}</p>
-        <p><strong>Valid Files:</strong> {report.valid_files}</p>
-        <p><strong>Invalid Files:</strong> {report.invalid_files}</p>
-        <p><strong>Average Score:</strong> {report.total_score}%</p>
-        <p><strong>Validation Rate:</strong> {report.summary['validation_rate']}%</p>
-    </div>
-
+    <p><strong>Generated:</strong> {generated}</p>
     <h2>Detailed Results</h2>
 """
 
-        for result in report.results:
-            status_class = "valid" if result.is_valid else "invalid"
-            html += f"""
-    <div class="result {status_class}">
-        <h3>{result.file_path}</h3>
-        <p><strong>Schema:</strong> {result.schema_name}</p>
-        <p><strong>Score:</strong> <span class="score">{result.score}%</span></p>
-"""
+    def begin(self) -> None:
+        self.out.write(self.HEAD.replace('{generated}', self.timestamp.strftime('%Y-%m-%d %H:%M:%S')))
 
-            if result.errors:
-                html += '<div class="errors"><strong>Errors:</strong><ul>'
-                for error in result.errors:
-                    html += f'<li>{error}</li>'
-                html += '</ul></div>'
+    def write_result(self, result: ValidationResult) -> None:
+        status_class = "valid" if result.is_valid else "invalid"
+        parts = [
+            f'    <details class="result {status_class}"{"" if result.is_valid else " open"}>\n'
+            f'        <summary>{"✅" if result.is_valid else "❌"} {html.escape(result.file_path)}'
+            f' &mdash; <span class="score">{result.score}%</span></summary>\n'
+            f'        <p><strong>Schema:</strong> {html.escape(result.schema_name)}</p>\n'
+        ]
+        for css, label, items in (('errors', 'Errors', result.errors), ('warnings', 'Warnings', result.warnings)):
+            if items:
+                parts.append(f'        <div class="{css}"><strong>{label}:</strong><ul>')
+                parts.extend(f'<li>{html.escape(str(item))}</li>' for item in items)
+                parts.append('</ul></div>\n')
+        parts.append('    </details>\n')
+        self.out.write(''.join(parts))
+
+    def end(self) -> None:
+        summary = self.summary
+        self.out.write(
+            '    <div class="summary">\n'
+            '        <h2>Summary</h2>\n'
+            f'        <p><strong>Total Files:</strong> {summary["total_files"]}</p>\n'
+            f'        <p><strong>Valid Files:</strong> {summary["valid_files"]}</p>\n'
+            f'        <p><strong>Invalid Files:</strong> {summary["invalid_files"]}</p>\n'
+            f'        <p><strong>Average Score:</strong> {summary["average_score"]}%</p>\n'
+            f'        <p><strong>Validation Rate:</strong> {summary["validation_rate"]}%</p>\n'
+            '    </div>\n'
+            '</body>\n'
+            '</html>\n'
+        )
 
-            if result.warnings:
-                html += '<div class="warnings"><strong>Warnings:</strong><ul>'
-                for warning in result.warnings:
-                    html += f'<li>{warning}</li>'
-                html += '</ul></div>'
 
-            html += '</div>'
+class JsonReportWriter(ReportWriter):
+    """A single JSON object: generated timestamp, a results array, then the summary."""
+
+    def begin(self) -> None:
+        self.out.write('{"generated": %s, "results": [' % json.dumps(self.timestamp.isoformat()))
+
+    def write_result(self, result: ValidationResult) -> None:
+        self.out.write(('\n' if self.total == 1 else ',\n') + json.dumps(asdict(result), default=str))
+
+    def end(self) -> None:
+        self.out.write('\n], "summary": %s}\n' % json.dumps(self.summary))
+
+
+# Characters XML 1.0 does not allow, even escaped
+_XML_INVALID = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
 
-        html += """
-</body>
-</html>
-"""
 
-        return html
+def _xml_text(value: Any) -> str:
+    return xml_escape(_XML_INVALID.sub('\ufffd', str(value)))
+
+
+class JUnitReportWriter(ReportWriter):
+    """JUnit XML with one testcase per result, for CI test-report viewers.
+
+    Counts are not known until the run ends, so the testsuite element carries
+    only its name and timestamp; CI consumers derive totals from the testcases.
+    """
+
+    def begin(self) -> None:
+        self.out.write('<?xml version="1.0" encoding="UTF-8"?>\n<testsuites>\n'
+                       f'  <testsuite name="schema-validator" timestamp="{self.timestamp.isoformat(timespec="seconds")}">\n')
+
+    def write_result(self, result: ValidationResult) -> None:
+        parts = [f'    <testcase classname={quoteattr(_XML_INVALID.sub("", result.schema_name))}'
+                 f' name={quoteattr(_XML_INVALID.sub("", result.file_path))}>\n']
+        if not result.is_valid:
+            message = result.errors[0] if result.errors else 'validation failed'
+            parts.append(f'      <failure message={quoteattr(_XML_INVALID.sub("", str(message)))}>'
+                         f'{_xml_text(chr(10).join(map(str, result.errors)))}</failure>\n')
+        if result.warnings:
+            parts.append(f'      <system-out>{_xml_text(chr(10).join(map(str, result.warnings)))}</system-out>\n')
+        parts.append('    </testcase>\n')
+        self.out.write(''.join(parts))
+
+    def end(self) -> None:
+        self.out.write('  </testsuite>\n</testsuites>\n')
+
+
+REPORT_WRITERS = {
+    'text': TextReportWriter,
+    'html': HtmlReportWriter,
+    'json': JsonReportWriter,
+    'junit': JUnitReportWriter,
+}
+
+class ValidationManifest:
+    """Persistent store of past results keyed on file and schema fingerprints.
+
+    An entry is reused when the file's size and mtime match (or, if they moved,
+    its content hash still matches), the schema it was validated against has the
+    same hash (which covers its quality rules), and the validator version and
+    error settings are unchanged. Auto-detection is covered by the document's top-level keys: the entry also
+    needs the same detection_inputs_hash for them, which only moves when a schema
+    sharing one of those keys changes its detection-relevant parts. A schema edit
+    therefore only invalidates the files that used that schema or could now be
+    detected differently because of it.
+    """
+
+    COLUMNS = ('path', 'size', 'mtime_ns', 'content_hash', 'schema_name', 'schema_hash',
+               'data_keys', 'detection_hash', 'config', 'result')
+
+    def __init__(self, path: str, config: str):
+        self.path = path
+        self.config = config
+        try:
+            self.conn = sqlite3.connect(path)
+        except sqlite3.DatabaseError as e:
+            raise ValueError(f"Cannot open manifest {path}: {e}") from e
+        try:
+            columns = tuple(row[1] for row in self.conn.execute("PRAGMA table_info(results)"))
+            if columns and columns != self.COLUMNS:
+                # Written by an older version; the manifest is only a cache, so start over
+                self.conn.execute("DROP TABLE results")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, content_hash TEXT,"
+                " schema_name TEXT, schema_hash TEXT, data_keys TEXT, detection_hash TEXT,"
+                " config TEXT, result TEXT)"
+            )
+        except sqlite3.DatabaseError as e:
+            # Most likely a path to some other file, such as a document meant for validation
+            self.conn.close()
+            raise ValueError(f"Cannot use {path} as a manifest: {e}") from e
+        self.writes: List[Tuple] = []
+
+    @classmethod
+    def for_validator(cls, path: str, validator: SchemaValidator) -> 'ValidationManifest':
+        return cls(path, f"{VALIDATOR_VERSION}:{validator.error_mode}:{validator.max_errors}:"
+                         f"{validator.verify_detection}:{validator.decoder}")
+
+    @staticmethod
+    def content_hash(file_path: str) -> str:
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def lookup(self, file_path: str, validator: SchemaValidator, st: Optional[os.stat_result] = None
+               ) -> Tuple[Optional[ValidationResult], Optional[Tuple[int, int, str]]]:
+        """Return (cached result or None, current (size, mtime_ns, content hash)).
+
+        st is the file's stat from collect_files when available.
+        """
+        if st is None:
+            try:
+                st = os.stat(file_path)
+            except OSError:
+                return None, None
+        row = self.conn.execute(
+            "SELECT size, mtime_ns, content_hash, schema_name, schema_hash, data_keys, detection_hash,"
+            " config, result FROM results WHERE path = ?", (file_path,)
+        ).fetchone()
+
+        if row is not None and (row[0], row[1]) == (st.st_size, st.st_mtime_ns):
+            content_hash = row[2]
+        else:
+            try:
+                content_hash = self.content_hash(file_path)
+            except OSError:
+                return None, None
+        fingerprint = (st.st_size, st.st_mtime_ns, content_hash)
+
+        if (row is None or row[2] != content_hash or row[7] != self.config
+                or validator.schema_hashes.get(row[3]) != row[4]
+                or validator.detection_inputs_hash(json.loads(row[5])) != row[6]):
+            return None, fingerprint
+        result = ValidationResult(**json.loads(row[8]))
+        if (row[0], row[1]) != fingerprint[:2]:
+            self.writes.append((file_path, *fingerprint, *row[3:]))
+        return result, fingerprint
+
+    def record(self, file_path: str, fingerprint: Optional[Tuple[int, int, str]],
+               result: ValidationResult, validator: SchemaValidator) -> None:
+        """Remember a fresh result under the fingerprint taken before validating it."""
+        if fingerprint is None:
+            return
+        keys = result.metadata.get('data_keys', [])
+        self.writes.append((
+            file_path, *fingerprint, result.schema_name, validator.schema_hashes.get(result.schema_name),
+            json.dumps(keys, ensure_ascii=False), validator.detection_inputs_hash(keys),
+            self.config, json.dumps(asdict(result), ensure_ascii=False)
+        ))
+        if len(self.writes) >= 1000:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.writes:
+            self.conn.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", self.writes)
+            self.writes = []
+        self.conn.commit()
+
+    def close(self) -> None:
+        self.flush()
+        self.conn.close()
+
+
+def benchmark_decoders(validator: SchemaValidator, file_paths: List[str], rounds: int = 5,
+                       out: TextIO = sys.stdout) -> None:
+    """Time read_document with every installed decoder, grouped by detected schema.
+
+    Each file is read and decoded rounds times per decoder; the best round is
+    reported, since the slower rounds mostly measure interference.
+    """
+    by_schema: Dict[str, List[Tuple[str, int]]] = {}
+    for file_path in file_paths:
+        try:
+            data, size = read_document(file_path, _stdlib_loads)
+        except Exception as e:
+            logger.error(f"Skipping {file_path}: {e}")
+            continue
+        schema_name = validator.detect_schema_type(data) if isinstance(data, dict) else 'unknown'
+        by_schema.setdefault(schema_name, []).append((file_path, size))
+
+    decoders = sorted(JSON_DECODERS)
+    out.write(f"{'Schema':<24}{'Files':>7}{'Avg KB':>9}"
+              + ''.join(f"{name + ' us/file':>18}{'MB/s':>9}" for name in decoders) + '\n')
+    for schema_name in sorted(by_schema):
+        files = by_schema[schema_name]
+        total_bytes = sum(size for _, size in files)
+        line = f"{schema_name:<24}{len(files):>7}{total_bytes / len(files) / 1024:>9.1f}"
+        for name in decoders:
+            decode = JSON_DECODERS[name]
+            best = float('inf')
+            for _ in range(rounds):
+                start = time.perf_counter()
+                for file_path, size in files:
+                    read_document(file_path, decode, size)
+                best = min(best, time.perf_counter() - start)
+            line += f"{best / len(files) * 1e6:>18.1f}{total_bytes / best / 1e6:>9.1f}"
+        out.write(line + '\n')
+
+
+_worker_validator: Optional[SchemaValidator] = None
+
+
+def _init_worker(schema_dir: str, log_level: int, error_mode: str, max_errors: int,
+                 verify_detection: bool, rules_dir: str, decoder: str) -> None:
+    """Build one SchemaValidator per worker process so schemas compile only once."""
+    global _worker_validator
+    logger.setLevel(log_level)
+    _worker_validator = SchemaValidator(schema_dir, error_mode, max_errors, verify_detection, rules_dir, decoder)
+
+
+def _validate_chunk(files: List[Tuple[str, Optional[int]]]) -> List[ValidationResult]:
+    return [_worker_validator.validate_file(file_path, size_hint=size) for file_path, size in files]
+
 
 def main():
     parser = argparse.ArgumentParser(description="Schema Validator for Prompting-Gold-Standard")
     parser.add_argument('files', nargs='*', help='JSON files to validate')
     parser.add_argument('--schema-dir', default='../JSON-Schemas', help='Directory containing schemas')
-    parser.add_argument('--batch', action='store_true', help='Process all JSON files in current directory')
-    parser.add_argument('--report', action='store_true', help='Generate HTML report')
+    parser.add_argument('--rules-dir', help='Directory containing quality rules (default: Quality-Rules next to the schema dir)')
+    parser.add_argument('--batch', action='store_true',
+                        help='Process all JSON/JSONL files under the current directory, recursively')
+    parser.add_argument('--include', action='append', default=[], metavar='GLOB',
+                        help='Only validate discovered files matching GLOB (repeatable)')
+    parser.add_argument('--exclude', action='append', default=[], metavar='GLOB',
+                        help='Skip discovered files and directories matching GLOB (repeatable)')
+    parser.add_argument('--watch', action='store_true',
+                        help='Keep polling the files/directories and revalidate files that change')
+    parser.add_argument('--watch-interval', type=float, default=2.0, metavar='SECONDS',
+                        help='Polling interval for --watch')
+    parser.add_argument('--report', action='store_true', help='Generate HTML report (same as --format html)')
+    parser.add_argument('--format', choices=sorted(REPORT_WRITERS), default='text',
+                        help='Output format; results are written incrementally as they are validated')
+    parser.add_argument('--output', metavar='PATH', help='Write the report to PATH instead of stdout')
     parser.add_argument('--strict', action='store_true', help='Fail on first validation error')
     parser.add_argument('--quiet', action='store_true', help='Suppress non-error output')
-
-    args = parser.parse_args()
+    parser.add_argument('--jobs', type=int, default=1, help='Number of worker processes for validation')
+    parser.add_argument('--array', action='store_true',
+                        help='Treat .json files as top-level arrays and validate each element')
+    parser.add_argument('--detect-verify', action='store_true',
+                        help='Validate ranked candidate schemas during auto-detection and keep the first match')
+    parser.add_argument('--manifest', metavar='PATH',
+                        help='Skip files whose content and schema are unchanged since the last run, '
+                             'tracked in the SQLite file PATH')
+    parser.add_argument('--incremental', action='store_true',
+                        help=f'Same as --manifest {DEFAULT_MANIFEST}')
+    parser.add_argument('--error-mode', choices=ERROR_MODES, default='best',
+                        help='best: one error per file; all: every error with its path; fast: valid/invalid only')
+    parser.add_argument('--max-errors', type=int, default=20, help='Cap on errors per file with --error-mode all')
+    parser.add_argument('--decoder', choices=DECODER_CHOICES, default='auto',
+                        help='JSON decoder for documents; auto uses orjson when it is installed')
+    parser.add_argument('--benchmark', action='store_true',
+                        help='Time reading and decoding the files with each available decoder, per schema')
+
+    args = parser.parse_intermixed_args()
 
     if args.quiet:
         logger.setLevel(logging.ERROR)
 
-    validator = SchemaValidator(args.schema_dir)
+    try:
+        validator = SchemaValidator(args.schema_dir, args.error_mode, args.max_errors, args.detect_verify,
+                                    args.rules_dir, args.decoder)
+    except ValueError as e:
+        parser.error(str(e))
 
     if args.batch:
-        # Batch process all JSON files
-        report = validator.batch_validate(['*.json'])
+        # Batch process every JSON/JSONL file under the current directory
+        patterns = ['.']
     elif args.files:
-        # Process specific files
-        results = []
-        for file_path in args.files:
-            result = validator.validate_file(file_path)
-            results.append(result)
-            if not result.is_valid and args.strict:
-                print(f"❌ {file_path} failed validation", file=sys.stderr)
-                sys.exit(1)
-
-        report = ValidationReport(
-            timestamp=datetime.now(),
-            total_files=len(results),
-            valid_files=sum(1 for r in results if r.is_valid),
-            invalid_files=sum(1 for r in results if not r.is_valid),
-            total_score=sum(r.score for r in results) / len(results) if results else 0,
-            results=results,
-            summary={}
-        )
+        # Process specific files, directories (recursively) and globs
+        patterns = args.files
     else:
         parser.print_help()
         sys.exit(1)
 
-    # Output results
-    if args.report:
-        html_report = validator.generate_html_report(report)
-        print(html_report)
-    else:
-        print(f"Validation Report - {report.timestamp.strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"Total Files: {report.total_files}")
-        print(f"Valid: {report.valid_files}")
-        print(f"Invalid: {report.invalid_files}")
-        print(".2f")
-        print(".2f")
+    if args.benchmark:
+        file_paths = validator.collect_files(patterns, args.include, args.exclude)
+        benchmark_decoders(validator, [f for f in file_paths if not validator.is_streamed(f, args.array)])
+        return
 
-        for result in report.results:
-            status = "✅" if result.is_valid else "❌"
-            print(f"{status} {result.file_path} (Score: {result.score}%)")
-            if result.errors:
-                for error in result.errors:
-                    print(f"   Error: {error}")
-            if result.warnings:
-                for warning in result.warnings:
-                    print(f"   Warning: {warning}")
+    manifest = None
+    manifest_path = args.manifest or (DEFAULT_MANIFEST if args.incremental else None)
+    if manifest_path:
+        try:
+            manifest = ValidationManifest.for_validator(manifest_path, validator)
+        except ValueError as e:
+            parser.error(str(e))
+
+    report_format = 'html' if args.report else args.format
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    # Results are written as they arrive so large runs keep constant memory
+    writer = REPORT_WRITERS[report_format](out)
+    if args.watch:
+        results = validator.watch(patterns, args.include, args.exclude, args.watch_interval,
+                                  args.jobs, args.array, manifest, on_cycle=writer.flush)
+    else:
+        # Discovery runs in a background thread, ahead of validation
+        results = validator.validate_many(validator.iter_files(patterns, args.include, args.exclude),
+                                          args.jobs, args.array, manifest)
+    try:
+        try:
+            for result in results:
+                writer.write(result)
+                if not result.is_valid and args.strict:
+                    print(f"❌ {result.file_path} failed validation", file=sys.stderr)
+                    results.close()  # stop workers and flush the manifest
+                    writer.close()
+                    sys.exit(1)
+        except KeyboardInterrupt:
+            if not args.watch:
+                raise
+            results.close()  # Ctrl-C ends a watch session; finish the report normally
+        writer.close()
+    finally:
+        if out is not sys.stdout:
+            out.close()
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,509 @@
+#!/usr/bin/env python3
+"""
+Benchmark Runner for the Scripts tools
+
+Measures content_guard.py, schema-validator.py and prompt_automation.py on the
+seeded corpus from generate_corpus.py (generated on first use), appends the run
+to a JSON history file and compares it with the most recent comparable run.
+
+Suites (each runs in a fresh child process, so peak RSS is per suite):
+    import             import time of each module, median over fresh interpreters
+    content_guard      analyze() latency percentiles and MB/s per document
+    schema_validator   schema load time; validate_data latency and docs/s per
+                       schema; validate_many over all payload files (auto-detect)
+                       with the count of valid/invalid mismatches; JSONL streaming
+    prompt_automation  batch_process over tasks.jsonl against a local mock backend,
+                       with zero latency (framework overhead) and with seeded
+                       per-task latency
+
+Metrics ending in _per_s are better when higher; everything else (latency in ms,
+peak RSS in MB, mismatch counts) is better when lower. A metric regresses when it
+is worse than the baseline by more than --threshold (relative; twice that for the
+p95/p99 tails) and by more than a small absolute noise floor. The baseline is the
+latest run in the history with the same corpus, Python version and machine.
+
+Usage:
+    python bench.py [options]
+
+Options:
+    --corpus DIR        Corpus directory (default: benchmarks/corpus)
+    --seed N            Seed used when the corpus has to be generated (default: 1234)
+    --suite NAME        Run only this suite (repeatable; default: all)
+    --history FILE      History file (default: benchmarks/history.json)
+    --label TEXT        Free-form label stored with the run
+    --threshold F       Relative regression threshold (default: 0.10)
+    --min-time S        Minimum measuring time per case in seconds (default: 0.5)
+    --import-rounds N   Fresh interpreters per import measurement (default: 5)
+    --check             Exit with status 1 when any metric regressed
+    --no-record         Compare only; do not append the run to the history
+    --compare           Compare the latest recorded run with its baseline and exit
+
+Examples:
+    # Record a baseline, change code, then gate on regressions
+    python bench.py --label before
+    python bench.py --label after --check
+
+    # Only the validator, with a stricter threshold
+    python bench.py --suite schema_validator --threshold 0.05
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import zlib
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from generate_corpus import (BENCH_DIR, DEFAULT_CORPUS_DIR, DEFAULT_SEED, REPO_DIR, SCRIPTS_DIR,
+                             generate, load_script)
+
+try:
+    import resource
+except ImportError:  # not available on Windows; peak RSS is then omitted
+    resource = None
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+SUITES = ('import', 'content_guard', 'schema_validator', 'prompt_automation')
+DEFAULT_HISTORY = BENCH_DIR / 'history.json'
+DEFAULT_THRESHOLD = 0.10
+PERCENTILES = (('p50', 0.50), ('p95', 0.95), ('p99', 0.99))
+MOCK_LATENCY_MS = 20.0
+
+# Absolute changes below these are noise whatever the relative change
+NOISE_FLOORS = (('_ms', 0.05), ('_mb', 2.0))
+# Tail percentiles rest on a few samples, so they get a proportionally looser threshold
+TAIL_METRICS = ('p95_ms', 'p99_ms')
+TAIL_THRESHOLD_FACTOR = 2.0
+
+IMPORTED_MODULES = {
+    'content_guard': 'import content_guard',
+    'prompt_automation': 'import prompt_automation',
+    'schema_validator': ("import importlib.util\n"
+                         "spec = importlib.util.spec_from_file_location('schema_validator', 'schema-validator.py')\n"
+                         "spec.loader.exec_module(importlib.util.module_from_spec(spec))"),
+}
+
+IMPORT_SNIPPET = """
+import json, sys, time
+sys.path.insert(0, '.')
+start = time.perf_counter()
+exec({code!r})
+elapsed = time.perf_counter() - start
+try:
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rss = rss / (1 << 20) if sys.platform == 'darwin' else rss / 1024
+except ImportError:
+    rss = None
+print(json.dumps({{'seconds': elapsed, 'rss_mb': rss}}))
+"""
+
+
+# --- measuring ---
+
+def peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1 << 20) if sys.platform == 'darwin' else rss / 1024, 1)
+
+
+def measure(fn: Callable[[], Any], min_time: float, max_rounds: int = 100000) -> List[float]:
+    """Per-call durations of fn, repeated until min_time has passed (at least once)."""
+    samples: List[float] = []
+    start = time.perf_counter()
+    while not samples or (time.perf_counter() - start < min_time and len(samples) < max_rounds):
+        t = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t)
+    return samples
+
+
+def latency_metrics(samples: List[float]) -> Dict[str, float]:
+    """Nearest-rank percentiles in ms, as content_guard's LatencyStats reports them."""
+    ordered = sorted(samples)
+    metrics = {f"{name}_ms": round(ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000, 4)
+               for name, p in PERCENTILES}
+    metrics['mean_ms'] = round(sum(ordered) / len(ordered) * 1000, 4)
+    return metrics
+
+
+def median(samples: List[float]) -> float:
+    ordered = sorted(samples)
+    mid = len(ordered) // 2
+    return ordered[mid] if len(ordered) % 2 else (ordered[mid - 1] + ordered[mid]) / 2
+
+
+# --- suites (run in a child process) ---
+
+def bench_import(corpus: Path, min_time: float, rounds: int) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for name, code in IMPORTED_MODULES.items():
+        seconds, rss = [], []
+        for _ in range(rounds):
+            proc = subprocess.run([sys.executable, '-c', IMPORT_SNIPPET.format(code=code)], cwd=SCRIPTS_DIR,
+                                  capture_output=True, text=True, check=True)
+            sample = json.loads(proc.stdout.strip().splitlines()[-1])
+            seconds.append(sample['seconds'])
+            if sample['rss_mb'] is not None:
+                rss.append(sample['rss_mb'])
+        results[name] = {'import_ms': round(median(seconds) * 1000, 3)}
+        if rss:
+            results[name]['peak_rss_mb'] = round(median(rss), 1)
+    return results
+
+
+def bench_content_guard(corpus: Path, min_time: float, rounds: int) -> Dict[str, Dict[str, float]]:
+    content_guard = load_script('content_guard', 'content_guard.py')
+    manifest = read_manifest(corpus)
+    results = {}
+    for doc in manifest['documents']:
+        path = corpus / doc
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        fmt = content_guard.resolve_format(str(path))
+        samples = measure(lambda: content_guard.analyze(text, fmt), min_time)
+        metrics = latency_metrics(samples)
+        metrics['mb_per_s'] = round(len(text) / (1 << 20) / median(samples), 3)
+        results[Path(doc).name] = metrics
+        del text
+    return results
+
+
+def bench_schema_validator(corpus: Path, min_time: float, rounds: int) -> Dict[str, Dict[str, float]]:
+    schema_validator = load_script('schema_validator', 'schema-validator.py')
+    logging.getLogger('schema_validator').setLevel(logging.WARNING)
+    schema_dir = str(REPO_DIR / 'JSON-Schemas')
+    manifest = read_manifest(corpus)
+    results = {'load': latency_metrics(measure(lambda: schema_validator.SchemaValidator(schema_dir), min_time))}
+    validator = schema_validator.SchemaValidator(schema_dir)
+
+    files = []
+    for schema_name in sorted(manifest['schemas']):
+        schema_files = sorted((corpus / 'schemas' / schema_name).glob('*.json'))
+        files.extend(schema_files)
+        documents = []
+        for path in schema_files:
+            with open(path, 'r', encoding='utf-8') as f:
+                documents.append(json.load(f))
+        if not documents:
+            continue
+        samples: List[float] = []
+        start = time.perf_counter()
+        while not samples or time.perf_counter() - start < min_time:
+            for data in documents:
+                t = time.perf_counter()
+                validator.validate_data(data, schema_name, schema_name)
+                samples.append(time.perf_counter() - t)
+        metrics = latency_metrics(samples)
+        metrics['docs_per_s'] = round(len(samples) / sum(samples), 1)
+        results[schema_name] = metrics
+
+    # Whole files with schema auto-detection, as the CLI validates them
+    mismatches = 0
+    start = time.perf_counter()
+    for result in validator.validate_many([str(path) for path in files]):
+        expected = Path(result.file_path).name.startswith('valid-')
+        mismatches += result.is_valid != expected
+    elapsed = time.perf_counter() - start
+    results['files'] = {'files_per_s': round(len(files) / elapsed, 1), 'mismatches': mismatches}
+
+    streams = sorted((corpus / 'schemas').glob('*.jsonl'))
+    count = 0
+    start = time.perf_counter()
+    for path in streams:
+        schema_name = path.stem
+        for _ in validator.validate_jsonl(str(path), schema_name):
+            count += 1
+    elapsed = time.perf_counter() - start
+    if count:
+        results['jsonl'] = {'docs_per_s': round(count / elapsed, 1)}
+    return results
+
+
+class MockBackend:
+    """Local PromptAutomation backend with deterministic per-prompt latency.
+
+    Latency is log-normal around mean_latency_ms and seeded by the prompt, so a
+    task takes the same time on every run whatever order the batch runs in.
+    """
+
+    SIGMA = 0.5
+
+    def __init__(self, mean_latency_ms: float = 0.0):
+        self.mean_latency_ms = mean_latency_ms
+
+    def latency(self, prompt: str) -> float:
+        if not self.mean_latency_ms:
+            return 0.0
+        rng = random.Random(zlib.crc32(prompt.encode('utf-8')))
+        mu = math.log(self.mean_latency_ms) - self.SIGMA ** 2 / 2
+        return rng.lognormvariate(mu, self.SIGMA) / 1000
+
+    async def __call__(self, config: Any, api_key: Optional[str], prompt: str,
+                       temperature: float, max_tokens: int, json_mode: bool) -> str:
+        delay = self.latency(prompt)
+        if delay:
+            await asyncio.sleep(delay)
+        words = prompt.split()[:max_tokens // 4]
+        if json_mode:
+            return json.dumps({'words': len(words), 'first': words[0] if words else ''})
+        return ' '.join(reversed(words))
+
+
+def bench_prompt_automation(corpus: Path, min_time: float, rounds: int) -> Dict[str, Dict[str, float]]:
+    prompt_automation = load_script('prompt_automation', 'prompt_automation.py')
+    with open(corpus / 'tasks.jsonl', 'r', encoding='utf-8') as f:
+        tasks = [json.loads(line) for line in f if line.strip()]
+    config = prompt_automation.ModelConfig(name='Mock', api_key_env='', base_url='local://mock', max_tokens=4096,
+                                           temperature=0.0, context_window=128000, supports_json_mode=True)
+    results = {}
+    for case, latency_ms in (('batch_overhead', 0.0), ('batch_mock_latency', MOCK_LATENCY_MS)):
+        automation = prompt_automation.PromptAutomation()
+        automation.register_backend('mock', config, MockBackend(latency_ms))
+        task_times: List[float] = []
+        failures = 0
+
+        def run_batch() -> None:
+            nonlocal failures
+            for result in asyncio.run(automation.batch_process(tasks)):
+                if result.get('success'):
+                    task_times.append(result['processing_time'])
+                else:
+                    failures += 1
+
+        batch_times = measure(run_batch, min_time)
+        metrics = latency_metrics(task_times)
+        metrics['batch_ms'] = round(median(batch_times) * 1000, 3)
+        metrics['tasks_per_s'] = round(len(tasks) / median(batch_times), 1)
+        metrics['failures'] = failures
+        automation.executor.shutdown(wait=False)
+        results[case] = metrics
+    return results
+
+
+SUITE_FUNCTIONS = {
+    'import': bench_import,
+    'content_guard': bench_content_guard,
+    'schema_validator': bench_schema_validator,
+    'prompt_automation': bench_prompt_automation,
+}
+
+
+def run_child(suite: str, corpus: Path, min_time: float, rounds: int) -> None:
+    """Child process entry point: print the suite's results as one JSON line."""
+    logging.getLogger().setLevel(logging.WARNING)
+    results = SUITE_FUNCTIONS[suite](corpus, min_time, rounds)
+    if suite != 'import':
+        rss = peak_rss_mb()
+        if rss is not None:
+            results['process'] = {'peak_rss_mb': rss}
+    print(json.dumps(results))
+
+
+def run_suite(suite: str, corpus: Path, min_time: float, rounds: int) -> Dict[str, Dict[str, float]]:
+    proc = subprocess.run([sys.executable, str(Path(__file__).resolve()), '--child', suite, '--corpus', str(corpus),
+                           '--min-time', str(min_time), '--import-rounds', str(rounds)],
+                          capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"suite {suite} failed:\n{proc.stderr.strip()}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+# --- history and comparison ---
+
+def read_manifest(corpus: Path) -> Dict[str, Any]:
+    with open(corpus / 'manifest.json', 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_history(path: Path) -> Dict[str, Any]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            history = json.load(f)
+    except FileNotFoundError:
+        return {'runs': []}
+    if not isinstance(history, dict) or not isinstance(history.get('runs'), list):
+        raise ValueError(f"{path} is not a benchmark history file")
+    return history
+
+
+def save_history(path: Path, history: Dict[str, Any]) -> None:
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(history, f, indent=2)
+        f.write('\n')
+    os.replace(tmp_path, path)
+
+
+def git_commit() -> Optional[str]:
+    try:
+        proc = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR,
+                              capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return proc.stdout.strip() or None
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def comparable(run: Dict[str, Any], other: Dict[str, Any]) -> bool:
+    keys = ('python', 'implementation', 'machine', 'cpu_count')
+    return (run['corpus_id'] == other['corpus_id']
+            and all(run['environment'].get(k) == other['environment'].get(k) for k in keys))
+
+
+def find_baseline(runs: List[Dict[str, Any]], run: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    return next((other for other in reversed(runs) if other is not run and comparable(run, other)), None)
+
+
+def higher_is_better(metric: str) -> bool:
+    return metric.endswith('_per_s')
+
+
+def noise_floor(metric: str) -> float:
+    return next((floor for suffix, floor in NOISE_FLOORS if metric.endswith(suffix)), 0.0)
+
+
+def compare(baseline: Dict[str, Any], run: Dict[str, Any], threshold: float
+            ) -> List[Tuple[str, float, float, Optional[float], bool]]:
+    """Rows of (suite/case/metric, baseline, current, relative change, regressed)."""
+    rows = []
+    for suite, cases in run['results'].items():
+        for case, metrics in cases.items():
+            for metric, value in metrics.items():
+                base = baseline['results'].get(suite, {}).get(case, {}).get(metric)
+                if base is None or value is None:
+                    continue
+                worse = base - value if higher_is_better(metric) else value - base
+                change = (value - base) / base if base else None
+                limit = threshold * TAIL_THRESHOLD_FACTOR if metric in TAIL_METRICS else threshold
+                if base:
+                    regressed = worse > abs(base) * limit and worse > noise_floor(metric)
+                else:
+                    regressed = worse > noise_floor(metric)
+                rows.append((f"{suite}/{case}/{metric}", base, value, change, regressed))
+    return rows
+
+
+def print_comparison(rows, baseline: Dict[str, Any]) -> None:
+    print(f"Baseline: {baseline['timestamp']} {baseline.get('label') or ''} ({baseline.get('commit') or 'unknown commit'})")
+    width = max((len(row[0]) for row in rows), default=10)
+    for name, base, value, change, regressed in rows:
+        delta = f"{change * 100:+7.1f}%" if change is not None else '      - '
+        print(f"  {name:<{width}} {base:>12g} -> {value:>12g} {delta}{'  REGRESSION' if regressed else ''}")
+
+
+def print_results(run: Dict[str, Any]) -> None:
+    for suite, cases in run['results'].items():
+        for case, metrics in cases.items():
+            summary = ', '.join(f"{metric}={value:g}" for metric, value in metrics.items() if value is not None)
+            print(f"  {suite}/{case}: {summary}")
+
+
+def report(history: Dict[str, Any], run: Dict[str, Any], threshold: float) -> int:
+    """Print the run against its baseline; returns the number of regressions."""
+    baseline = find_baseline(history['runs'], run)
+    if baseline is None:
+        print("No comparable baseline in the history; results:")
+        print_results(run)
+        return 0
+    rows = compare(baseline, run, threshold)
+    print_comparison(rows, baseline)
+    regressions = [row[0] for row in rows if row[4]]
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond {threshold:.0%}: {', '.join(regressions)}")
+    else:
+        print(f"No regressions beyond {threshold:.0%}")
+    return len(regressions)
+
+
+def main():
+    """Main CLI interface"""
+    parser = argparse.ArgumentParser(description="Benchmark the Scripts tools on a seeded corpus")
+    parser.add_argument('--corpus', default=str(DEFAULT_CORPUS_DIR), help='Corpus directory')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help='Seed used when generating the corpus')
+    parser.add_argument('--suite', action='append', choices=SUITES, help='Run only this suite (repeatable)')
+    parser.add_argument('--history', default=str(DEFAULT_HISTORY), help='History file')
+    parser.add_argument('--label', default='', help='Label stored with the run')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help='Relative regression threshold')
+    parser.add_argument('--min-time', type=float, default=0.5, help='Minimum measuring time per case (seconds)')
+    parser.add_argument('--import-rounds', type=int, default=5, help='Fresh interpreters per import measurement')
+    parser.add_argument('--check', action='store_true', help='Exit with status 1 when any metric regressed')
+    parser.add_argument('--no-record', action='store_true', help='Do not append the run to the history')
+    parser.add_argument('--compare', action='store_true', help='Compare the latest recorded run and exit')
+    parser.add_argument('--child', choices=SUITES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    corpus = Path(args.corpus)
+    if args.child:
+        run_child(args.child, corpus, args.min_time, args.import_rounds)
+        return
+
+    history_path = Path(args.history)
+    try:
+        history = load_history(history_path)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.compare:
+        if not history['runs']:
+            parser.error(f"no runs recorded in {history_path}")
+        regressions = report(history, history['runs'][-1], args.threshold)
+        sys.exit(1 if args.check and regressions else 0)
+
+    if not (corpus / 'manifest.json').exists():
+        logger.info(f"Generating corpus in {corpus} (seed {args.seed})")
+        generate(corpus, seed=args.seed)
+    manifest = read_manifest(corpus)
+
+    run = {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'label': args.label,
+        'commit': git_commit(),
+        'corpus_id': manifest['corpus_id'],
+        'seed': manifest['seed'],
+        'environment': environment(),
+        'settings': {'min_time': args.min_time, 'import_rounds': args.import_rounds},
+        'results': {}
+    }
+    for suite in args.suite or SUITES:
+        logger.info(f"Running {suite}...")
+        start = time.perf_counter()
+        try:
+            run['results'][suite] = run_suite(suite, corpus, args.min_time, args.import_rounds)
+        except RuntimeError as e:
+            logger.error(str(e))
+            sys.exit(1)
+        logger.info(f"{suite} finished in {time.perf_counter() - start:.1f}s")
+
+    regressions = report(history, run, args.threshold)
+    if not args.no_record:
+        history['runs'].append(run)
+        save_history(history_path, history)
+        logger.info(f"Recorded run in {history_path}")
+    sys.exit(1 if args.check and regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
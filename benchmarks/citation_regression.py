@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Citation Matcher Regression Check for content_guard.py
+
+Guards CITATION_PATTERN / find_citations() against two regressions:
+    backtracking   pathological 200k-char inputs (unbalanced '(' followed by
+                   digits, repeated years, 'doi:' followed by whitespace, nested
+                   parentheses, unclosed '[' followed by digits) must each match
+                   within a time bound. Each runs in a child process that is
+                   killed at the hard timeout, so a backtracking pattern fails
+                   the check instead of hanging it.
+    semantics      find_citations() must agree with a plain character scanner
+                   that spells out the intended matching rules, on the
+                   pathological inputs and on seeded random strings.
+
+Usage:
+    python citation_regression.py [options]
+
+Options:
+    --max-ms MS         Time bound per pathological input in ms (default: 250)
+    --timeout S         Hard timeout per pathological input in s (default: 10)
+    --length N          Length of the pathological inputs (default: 200000)
+    --fuzz N            Number of random strings to compare (default: 20000)
+    --seed N            Seed for the random strings (default: 1234)
+
+Exits with status 1 when any input is too slow or any result differs.
+"""
+
+import argparse
+import logging
+import multiprocessing
+import queue
+import random
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from generate_corpus import load_script
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_MS = 250.0
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_LENGTH = 200_000
+DEFAULT_FUZZ = 20_000
+DEFAULT_SEED = 1234
+
+DIGITS = '0123456789'
+# Alphabet for the random strings: every character the pattern branches on
+FUZZ_TOKENS = ['(', ')', '[', ']', 'S', '1', '2', '0', '9', ' ', '\n', 'a', 'doi:', '10.', 'http://', 'https://']
+
+Span = Tuple[int, int, str]
+
+
+def pathological_inputs(length: int) -> Dict[str, str]:
+    """Inputs that made the old backtracking pattern quadratic, padded to length."""
+    def fill(unit: str, prefix: str = '') -> str:
+        return (prefix + unit * (length // len(unit) + 1))[:length]
+
+    half = length // 2
+    return {
+        'unbalanced_paren_digits': fill('1', '('),
+        'repeated_years': fill('(2020 '),
+        'doi_whitespace': fill(' ', 'doi:'),
+        'nested_parens': '(' * half + ')' * (length - half),
+        'nested_parens_with_year': '(' * half + '2020' + ')' * (length - half - 4),
+        'unclosed_bracket_digits': fill('1', '['),
+    }
+
+
+def _match_bracket(text: str, i: int) -> Optional[int]:
+    # [S<digits>] or [<digits>]
+    j = i + 1
+    if j < len(text) and text[j] == 'S':
+        j += 1
+    start = j
+    while j < len(text) and text[j] in DIGITS:
+        j += 1
+    if j > start and j < len(text) and text[j] == ']':
+        return j + 1
+    return None
+
+
+def _match_author_year(text: str, i: int) -> Optional[int]:
+    # One (...) pair with no parentheses inside and a four-digit run somewhere in it
+    j = i + 1
+    while j < len(text) and text[j] not in '()':
+        j += 1
+    if j >= len(text) or text[j] != ')':
+        return None
+    run = 0
+    for ch in text[i + 1:j]:
+        run = run + 1 if ch in DIGITS else 0
+        if run >= 4:
+            return j + 1
+    return None
+
+
+def _match_non_space_run(text: str, j: int) -> Optional[int]:
+    end = j
+    while end < len(text) and not text[end].isspace():
+        end += 1
+    return end if end > j else None
+
+
+def _match_doi(text: str, i: int) -> Optional[int]:
+    j = i + len('doi:')
+    while j < len(text) and text[j].isspace():
+        j += 1
+    if not text.startswith('10.', j):
+        return None
+    return _match_non_space_run(text, j + len('10.'))
+
+
+def _match_url(text: str, i: int) -> Optional[int]:
+    for scheme in ('https://', 'http://'):
+        if text.startswith(scheme, i):
+            return _match_non_space_run(text, i + len(scheme))
+    return None
+
+
+def reference_citations(text: str) -> List[Span]:
+    """Left-to-right, non-overlapping scan; the first form matching at a position wins."""
+    forms: List[Tuple[str, Callable[[str, int], Optional[int]]]] = [
+        ('bracket', lambda t, i: _match_bracket(t, i) if t[i] == '[' else None),
+        ('author_year', lambda t, i: _match_author_year(t, i) if t[i] == '(' else None),
+        ('doi', lambda t, i: _match_doi(t, i) if t.startswith('doi:', i) else None),
+        ('url', _match_url),
+    ]
+    spans = []
+    i = 0
+    while i < len(text):
+        for kind, match in forms:
+            end = match(text, i)
+            if end is not None:
+                spans.append((i, end, kind))
+                i = end
+                break
+        else:
+            i += 1
+    return spans
+
+
+def _time_find_citations(text: str, results) -> None:
+    content_guard = load_script('content_guard', 'content_guard.py')
+    start = time.perf_counter()
+    spans = content_guard.find_citations(text)
+    results.put(((time.perf_counter() - start) * 1000, spans))
+
+
+def check_pathological(length: int, max_ms: float, timeout: float) -> int:
+    failures = 0
+    for name, text in pathological_inputs(length).items():
+        # A regex stuck in C code cannot be interrupted in-process; kill a child instead
+        results = multiprocessing.Queue()
+        worker = multiprocessing.Process(target=_time_find_citations, args=(text, results))
+        worker.start()
+        try:
+            elapsed_ms, spans = results.get(timeout=timeout)
+        except queue.Empty:
+            worker.kill()
+            worker.join()
+            failures += 1
+            logger.error(f"{name}: no result within {timeout:.0f} s")
+            continue
+        worker.join()
+        if elapsed_ms > max_ms:
+            failures += 1
+            logger.error(f"{name}: {elapsed_ms:.1f} ms exceeds {max_ms:.0f} ms")
+        elif spans != reference_citations(text):
+            failures += 1
+            logger.error(f"{name}: spans differ from the reference")
+        else:
+            logger.info(f"{name}: {elapsed_ms:.1f} ms, {len(spans)} spans")
+    return failures
+
+
+def check_fuzz(content_guard, count: int, seed: int) -> int:
+    rng = random.Random(seed)
+    failures = 0
+    for _ in range(count):
+        text = ''.join(rng.choice(FUZZ_TOKENS) for _ in range(rng.randint(0, 40)))
+        expected = reference_citations(text)
+        actual = content_guard.find_citations(text)
+        if actual != expected:
+            failures += 1
+            if failures <= 5:
+                logger.error(f"mismatch for {text!r}: got {actual}, expected {expected}")
+    if failures:
+        logger.error(f"{failures}/{count} random strings differ from the reference")
+    else:
+        logger.info(f"{count} random strings agree with the reference")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Regression check for the content_guard citation matcher')
+    parser.add_argument('--max-ms', type=float, default=DEFAULT_MAX_MS,
+                        help=f'Time bound per pathological input in ms (default: {DEFAULT_MAX_MS:.0f})')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT,
+                        help=f'Hard timeout per pathological input in s (default: {DEFAULT_TIMEOUT:.0f})')
+    parser.add_argument('--length', type=int, default=DEFAULT_LENGTH,
+                        help=f'Length of the pathological inputs (default: {DEFAULT_LENGTH})')
+    parser.add_argument('--fuzz', type=int, default=DEFAULT_FUZZ,
+                        help=f'Number of random strings to compare (default: {DEFAULT_FUZZ})')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED,
+                        help=f'Seed for the random strings (default: {DEFAULT_SEED})')
+    args = parser.parse_args()
+
+    content_guard = load_script('content_guard', 'content_guard.py')
+    failures = check_pathological(args.length, args.max_ms, args.timeout)
+    failures += check_fuzz(content_guard, args.fuzz, args.seed)
+    if failures:
+        logger.error(f"Citation regression check failed ({failures} failures)")
+        sys.exit(1)
+    logger.info("Citation regression check passed")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,466 @@
+#!/usr/bin/env python3
+"""
+Synthetic Benchmark Corpus Generator
+
+Writes a reproducible input corpus for benchmarks/bench.py. The same seed and
+options always produce byte-identical files:
+
+- content_guard/doc-<size>.txt and .md: prose with claims, citations, quotes and
+  (for .md) front matter, headings, code fences and tables, from 1K up to 1G
+- schemas/<schema>/valid-NNN.json and invalid-NNN.json: payloads generated from
+  every schema in JSON-Schemas (refs inlined), checked with SchemaValidator so
+  valid payloads pass and each invalid one breaks exactly one constraint
+- schemas/<schema>.jsonl: the valid payloads of each schema as one JSONL stream
+- tasks.jsonl: batch_process task batches for the mock backend in bench.py
+- manifest.json: seed, options and file list; bench.py keys its history on it
+
+Usage:
+    python generate_corpus.py [options]
+
+Options:
+    --out DIR           Output directory (default: benchmarks/corpus)
+    --seed N            Random seed (default: 1234)
+    --sizes LIST        content_guard document sizes, comma separated, with K/M/G
+                        suffixes (default: 1K,16K,256K,4M; up to 1G)
+    --formats LIST      Document formats: txt, md or both (default: txt,md)
+    --payloads N        Valid and invalid payloads per schema (default: 20)
+    --tasks N           batch_process tasks (default: 500)
+    --schema-dir DIR    Directory containing JSON schemas (default: the repository's
+                        JSON-Schemas, resolved relative to this script)
+
+Examples:
+    # Default corpus
+    python generate_corpus.py
+
+    # Add a 1 GB document for content_guard scaling runs
+    python generate_corpus.py --sizes 1K,1M,64M,1G --formats md
+"""
+
+import argparse
+import hashlib
+import importlib.util
+import json
+import logging
+import random
+import re
+import string
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+# Bump whenever generated content changes so history entries are not compared across corpora.
+CORPUS_VERSION = "1"
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_DIR = BENCH_DIR.parent
+SCRIPTS_DIR = REPO_DIR / 'Scripts'
+DEFAULT_CORPUS_DIR = BENCH_DIR / 'corpus'
+DEFAULT_SCHEMA_DIR = REPO_DIR / 'JSON-Schemas'
+DEFAULT_SEED = 1234
+DEFAULT_SIZES = '1K,16K,256K,4M'
+DEFAULT_FORMATS = 'txt,md'
+DOC_FORMATS = ('txt', 'md')
+MAX_DOC_SIZE = 1 << 30
+
+_SIZE = re.compile(r'^(\d+)([KMG]?)$', re.IGNORECASE)
+_SIZE_UNITS = {'': 1, 'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30}
+
+WORDS = (
+    'analysis', 'baseline', 'cohort', 'context', 'dataset', 'effect', 'estimate', 'evidence',
+    'finding', 'model', 'outcome', 'pattern', 'policy', 'productivity', 'protocol', 'review',
+    'sample', 'signal', 'source', 'study', 'survey', 'team', 'trend', 'variance', 'workflow',
+    'remote', 'hybrid', 'autonomy', 'collaboration', 'latency', 'quality', 'method', 'result'
+)
+AUTHORS = ('Smith', 'Garcia', 'Chen', 'Okafor', 'Novak', 'Haddad', 'Tanaka', 'Silva', 'Kowalski')
+ORGS = ('National Science Board', 'World Health Organization', 'Open Research Group', 'Data Ethics Council')
+
+
+def load_script(module_name: str, file_name: str) -> Any:
+    """Import a Scripts/ module by file name (schema-validator.py has a hyphen)."""
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+    if str(SCRIPTS_DIR) not in sys.path:
+        sys.path.insert(0, str(SCRIPTS_DIR))
+    spec = importlib.util.spec_from_file_location(module_name, SCRIPTS_DIR / file_name)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def parse_size(text: str) -> int:
+    match = _SIZE.match(text.strip())
+    if not match:
+        raise ValueError(f"Invalid size: {text!r} (expected e.g. 512, 16K, 4M, 1G)")
+    size = int(match.group(1)) * _SIZE_UNITS[match.group(2).upper()]
+    if not 0 < size <= MAX_DOC_SIZE:
+        raise ValueError(f"Size out of range (1 byte to 1G): {text}")
+    return size
+
+
+def size_label(size: int) -> str:
+    for suffix in ('G', 'M', 'K'):
+        unit = _SIZE_UNITS[suffix]
+        if size % unit == 0:
+            return f"{size // unit}{suffix}"
+    return str(size)
+
+
+# --- content_guard documents ---
+
+def sentence(rng: random.Random) -> str:
+    """One sentence; roughly half are claim-like and most of those carry a citation."""
+    words = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(6, 18)))
+    kind = rng.random()
+    if kind < 0.25:
+        text = f"{rng.randint(2, 95)}% of the {words}"
+    elif kind < 0.4:
+        text = f"The {rng.choice(ORGS)} reported that {words}"
+    elif kind < 0.5:
+        text = f"As one participant put it, \"{words}\""
+    else:
+        text = words.capitalize()
+    cite = rng.random()
+    if cite < 0.2:
+        text += f" [{rng.randint(1, 40)}]"
+    elif cite < 0.35:
+        text += f" ({rng.choice(AUTHORS)}, {rng.randint(1995, 2025)})"
+    elif cite < 0.4:
+        text += f" (doi: 10.{rng.randint(1000, 99999)}/bench.{rng.randint(1, 9999)})"
+    elif cite < 0.43:
+        text += f" https://example.org/{rng.choice(WORDS)}/{rng.randint(1, 999)}"
+    return text + rng.choice('...!?')
+
+
+def paragraph(rng: random.Random) -> str:
+    return ' '.join(sentence(rng) for _ in range(rng.randint(2, 7)))
+
+
+def markdown_block(rng: random.Random, index: int) -> str:
+    """A prose paragraph, with a heading, list, code fence or table mixed in now and then."""
+    roll = rng.random()
+    if index % 8 == 0:
+        return f"{'#' * rng.randint(1, 3)} {rng.choice(WORDS).capitalize()} {rng.choice(WORDS)} {index}"
+    if roll < 0.08:
+        return '\n'.join(f"- {sentence(rng)}" for _ in range(rng.randint(2, 5)))
+    if roll < 0.13:
+        body = '\n'.join(f"value_{i} = {rng.randint(0, 999)}  # {rng.choice(WORDS)}" for i in range(rng.randint(2, 6)))
+        return f"```python\n{body}\n```"
+    if roll < 0.17:
+        rows = '\n'.join(f"| {rng.choice(WORDS)} | {rng.randint(0, 100)} | {rng.random():.3f} |"
+                         for _ in range(rng.randint(2, 6)))
+        return f"| term | count | share |\n| --- | --- | --- |\n{rows}"
+    return paragraph(rng)
+
+
+def write_document(path: Path, size: int, fmt: str, rng: random.Random) -> None:
+    """Write an ASCII document of exactly size bytes.
+
+    Blocks are drawn from a pool generated up front, so large documents cost about
+    as much to write as to copy; the pool is big enough that small documents have
+    no repeats and large ones still vary paragraph to paragraph.
+    """
+    pool_size = max(16, min(2048, size // 400))
+    if fmt == 'md':
+        pool = [markdown_block(rng, i) for i in range(pool_size)]
+        header = (f"---\ntitle: Synthetic benchmark document\nsize: {size_label(size)}\n---\n\n"
+                  "Disclosure: drafted with an AI assistant and reviewed by the authors.\n\n")
+    else:
+        pool = [paragraph(rng) for _ in range(pool_size)]
+        header = "This synthetic report was generated with a seeded text generator.\n\n"
+    written = 0
+    with open(path, 'w', encoding='ascii', newline='\n') as f:
+        chunk = [header[:size]]
+        written = len(chunk[0])
+        index = 0
+        while written < size:
+            block = (pool[index] if index < pool_size else rng.choice(pool)) + '\n\n'
+            block = block[:size - written]
+            chunk.append(block)
+            written += len(block)
+            index += 1
+            if len(chunk) >= 1024:
+                f.write(''.join(chunk))
+                chunk = []
+        f.write(''.join(chunk))
+
+
+# --- schema payloads ---
+
+class PayloadGenerator:
+    """Random instances of a JSON Schema with its references already inlined.
+
+    Covers the keywords the schemas in JSON-Schemas use: type, properties,
+    required, additionalProperties, items, enum, const, minimum/maximum,
+    minLength/maxLength, minItems/maxItems, pattern and date/date-time formats.
+    """
+
+    OPTIONAL_PROBABILITY = 0.7
+
+    def __init__(self, rng: random.Random):
+        self.rng = rng
+
+    def instance(self, schema: Any, depth: int = 0) -> Any:
+        if not isinstance(schema, dict):
+            return {}
+        if 'const' in schema:
+            return schema['const']
+        if 'enum' in schema:
+            return self.rng.choice(schema['enum'])
+        kind = self.schema_type(schema)
+        if kind == 'object':
+            return self.object_instance(schema, depth)
+        if kind == 'array':
+            return self.array_instance(schema, depth)
+        if kind == 'string':
+            return self.string_instance(schema)
+        if kind == 'integer':
+            low, high = self.bounds(schema, 0, 1000)
+            return self.rng.randint(int(low), int(high))
+        if kind == 'number':
+            low, high = self.bounds(schema, 0.0, 100.0)
+            return round(self.rng.uniform(low, high), 3)
+        if kind == 'boolean':
+            return self.rng.random() < 0.5
+        if kind == 'null':
+            return None
+        return self.rng.choice(WORDS)
+
+    @staticmethod
+    def schema_type(schema: Dict) -> Optional[str]:
+        kind = schema.get('type')
+        if isinstance(kind, list):
+            kind = next((k for k in kind if k != 'null'), kind[0] if kind else None)
+        if kind is None and 'properties' in schema:
+            kind = 'object'
+        return kind
+
+    @staticmethod
+    def bounds(schema: Dict, low: float, high: float) -> Tuple[float, float]:
+        low = schema.get('minimum', low if 'maximum' not in schema else min(low, schema['maximum']))
+        high = schema.get('maximum', max(high, low))
+        return low, high
+
+    def object_instance(self, schema: Dict, depth: int) -> Dict:
+        required = set(schema.get('required', ()))
+        value = {}
+        for name, subschema in schema.get('properties', {}).items():
+            if name in required or (depth < 6 and self.rng.random() < self.OPTIONAL_PROBABILITY):
+                value[name] = self.instance(subschema, depth + 1)
+        extra = schema.get('additionalProperties')
+        if isinstance(extra, dict) and not schema.get('properties'):
+            for _ in range(self.rng.randint(1, 3)):
+                value[f"{self.rng.choice(WORDS)}_{self.rng.randint(1, 99)}"] = self.instance(extra, depth + 1)
+        return value
+
+    def array_instance(self, schema: Dict, depth: int) -> List:
+        low = schema.get('minItems', 0)
+        high = min(schema.get('maxItems', low + 3), low + 3)
+        if depth >= 6:
+            high = low
+        items = schema.get('items', {})
+        return [self.instance(items, depth + 1) for _ in range(self.rng.randint(low, high))]
+
+    def string_instance(self, schema: Dict) -> str:
+        fmt = schema.get('format')
+        if fmt in ('date', 'date-time'):
+            moment = datetime(2020, 1, 1, tzinfo=timezone.utc) + timedelta(seconds=self.rng.randint(0, 6 * 365 * 86400))
+            return moment.strftime('%Y-%m-%d') if fmt == 'date' else moment.strftime('%Y-%m-%dT%H:%M:%SZ')
+        if fmt == 'uri':
+            return f"https://example.org/{self.rng.choice(WORDS)}/{self.rng.randint(1, 999)}"
+        if fmt == 'email':
+            return f"{self.rng.choice(AUTHORS).lower()}@example.org"
+        low = schema.get('minLength', 0)
+        high = schema.get('maxLength', max(low, 80))
+        pattern = schema.get('pattern')
+        if pattern:
+            return self.pattern_instance(pattern, low, high)
+        text = ' '.join(self.rng.choice(WORDS) for _ in range(self.rng.randint(2, 12)))
+        while len(text) < low:
+            text += ' ' + self.rng.choice(WORDS)
+        return text[:high].rstrip() if len(text[:high].rstrip()) >= low else text[:high]
+
+    def pattern_instance(self, pattern: str, low: int, high: int) -> str:
+        """A string for pattern, from a few common id shapes; the first that matches wins."""
+        alnum = string.ascii_letters + string.digits
+        length = self.rng.randint(max(low, 8), max(min(high, 32), max(low, 8)))
+        candidates = [
+            ''.join(self.rng.choice(alnum) for _ in range(length)),
+            f"10.{self.rng.randint(1000, 99999)}/BENCH.{self.rng.randint(1, 9999)}",
+            f"{self.rng.choice(WORDS)}-{self.rng.randint(1, 9999)}",
+        ]
+        for candidate in candidates:
+            if re.search(pattern, candidate):
+                return candidate
+        return candidates[0]
+
+    def invalid_instance(self, schema: Dict, validator: Any) -> Optional[Tuple[Any, str]]:
+        """A valid instance with one constraint broken, and a note of which one."""
+        for _ in range(20):
+            data = self.instance(schema)
+            mutation = self.mutate(schema, data)
+            if mutation is not None and not validator.is_valid(data):
+                return data, mutation
+        return None
+
+    def mutate(self, schema: Dict, data: Dict) -> Optional[str]:
+        required = [name for name in schema.get('required', ()) if name in data]
+        properties = [name for name in schema.get('properties', {}) if name in data]
+        choices = []
+        if required:
+            choices.append('drop')
+        if properties:
+            choices.append('retype')
+        enum_props = [name for name in properties if 'enum' in schema['properties'][name]]
+        if enum_props:
+            choices.append('enum')
+        bounded = [name for name in properties if 'maximum' in schema['properties'][name]]
+        if bounded:
+            choices.append('range')
+        if not choices:
+            return None
+        choice = self.rng.choice(choices)
+        if choice == 'drop':
+            name = self.rng.choice(required)
+            del data[name]
+            return f"missing required property '{name}'"
+        if choice == 'enum':
+            name = self.rng.choice(enum_props)
+            data[name] = 'not-a-listed-value'
+            return f"'{name}' outside its enum"
+        if choice == 'range':
+            name = self.rng.choice(bounded)
+            data[name] = schema['properties'][name]['maximum'] + 1
+            return f"'{name}' above its maximum"
+        name = self.rng.choice(properties)
+        data[name] = [] if isinstance(data[name], (str, int, float, bool, dict)) or data[name] is None else 'wrong-type'
+        return f"'{name}' has the wrong type"
+
+
+def write_json(path: Path, value: Any) -> None:
+    with open(path, 'w', encoding='utf-8', newline='\n') as f:
+        json.dump(value, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+
+
+def generate_payloads(out_dir: Path, schema_dir: Path, count: int, seed: int) -> Dict[str, Dict[str, Any]]:
+    """Valid and invalid payloads per schema; returns per-schema counts and notes."""
+    schema_validator = load_script('schema_validator', 'schema-validator.py')
+    logging.getLogger('schema_validator').setLevel(logging.WARNING)
+    validator = schema_validator.SchemaValidator(str(schema_dir))
+    summary = {}
+    for schema_name in sorted(validator.resolved_schemas):
+        rng = random.Random(f"{seed}:schema:{schema_name}")
+        generator = PayloadGenerator(rng)
+        schema = validator.resolved_schemas[schema_name]
+        compiled = validator.validators[schema_name]
+        target = out_dir / 'schemas' / schema_name
+        target.mkdir(parents=True, exist_ok=True)
+        valid = []
+        for i in range(count):
+            data = generator.instance(schema)
+            if not compiled.is_valid(data):
+                error = next(compiled.iter_errors(data)).message
+                logger.warning(f"{schema_name}: generated payload {i} is not valid ({error}); skipped")
+                continue
+            valid.append(data)
+            write_json(target / f"valid-{i:03d}.json", data)
+        invalid = {}
+        for i in range(count):
+            result = generator.invalid_instance(schema, compiled)
+            if result is None:
+                continue
+            data, mutation = result
+            invalid[f"invalid-{i:03d}.json"] = mutation
+            write_json(target / f"invalid-{i:03d}.json", data)
+        with open(out_dir / 'schemas' / f"{schema_name}.jsonl", 'w', encoding='utf-8', newline='\n') as f:
+            for data in valid:
+                f.write(json.dumps(data, ensure_ascii=False) + '\n')
+        summary[schema_name] = {'valid': len(valid), 'invalid': len(invalid), 'mutations': invalid}
+        logger.info(f"{schema_name}: {len(valid)} valid, {len(invalid)} invalid payloads")
+    return summary
+
+
+# --- batch_process tasks ---
+
+def generate_tasks(path: Path, count: int, seed: int) -> None:
+    """Tasks for PromptAutomation.batch_process against bench.py's mock backend."""
+    rng = random.Random(f"{seed}:tasks")
+    with open(path, 'w', encoding='utf-8', newline='\n') as f:
+        for i in range(count):
+            task = {
+                'task_id': i,
+                'model': 'mock',
+                'prompt': ' '.join(sentence(rng) for _ in range(rng.randint(1, 40))),
+                'temperature': rng.choice((0.0, 0.3, 0.7)),
+                'max_tokens': rng.choice((256, 1024, 4096)),
+                'json_mode': rng.random() < 0.3
+            }
+            f.write(json.dumps(task) + '\n')
+
+
+def generate(out_dir: Path = DEFAULT_CORPUS_DIR, seed: int = DEFAULT_SEED, sizes: str = DEFAULT_SIZES,
+             formats: str = DEFAULT_FORMATS, payloads: int = 20, tasks: int = 500,
+             schema_dir: Path = DEFAULT_SCHEMA_DIR) -> Dict[str, Any]:
+    """Write the corpus and its manifest; returns the manifest."""
+    out_dir = Path(out_dir)
+    doc_sizes = [parse_size(s) for s in sizes.split(',') if s.strip()]
+    doc_formats = [f.strip() for f in formats.split(',') if f.strip()]
+    unknown = [f for f in doc_formats if f not in DOC_FORMATS]
+    if unknown:
+        raise ValueError(f"Unknown document format(s): {', '.join(unknown)}")
+
+    docs_dir = out_dir / 'content_guard'
+    docs_dir.mkdir(parents=True, exist_ok=True)
+    documents = []
+    for size in doc_sizes:
+        for fmt in doc_formats:
+            path = docs_dir / f"doc-{size_label(size)}.{fmt}"
+            write_document(path, size, fmt, random.Random(f"{seed}:doc:{size}:{fmt}"))
+            documents.append(path.relative_to(out_dir).as_posix())
+            logger.info(f"Wrote {path} ({size_label(size)})")
+
+    schemas = generate_payloads(out_dir, Path(schema_dir), payloads, seed)
+    generate_tasks(out_dir / 'tasks.jsonl', tasks, seed)
+    logger.info(f"Wrote {tasks} batch_process tasks")
+
+    config = {'version': CORPUS_VERSION, 'seed': seed, 'sizes': [size_label(s) for s in doc_sizes],
+              'formats': doc_formats, 'payloads': payloads, 'tasks': tasks}
+    manifest = {
+        **config,
+        'corpus_id': hashlib.sha256(json.dumps(config, sort_keys=True).encode('utf-8')).hexdigest()[:16],
+        'documents': documents,
+        'schemas': schemas
+    }
+    write_json(out_dir / 'manifest.json', manifest)
+    return manifest
+
+
+def main():
+    """Main CLI interface"""
+    parser = argparse.ArgumentParser(description="Generate the seeded benchmark corpus")
+    parser.add_argument('--out', default=str(DEFAULT_CORPUS_DIR), help='Output directory')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help='Random seed')
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help='content_guard document sizes (1K..1G)')
+    parser.add_argument('--formats', default=DEFAULT_FORMATS, help='Document formats: txt, md or both')
+    parser.add_argument('--payloads', type=int, default=20, help='Valid and invalid payloads per schema')
+    parser.add_argument('--tasks', type=int, default=500, help='batch_process tasks')
+    parser.add_argument('--schema-dir', default=str(DEFAULT_SCHEMA_DIR), help='Directory containing JSON schemas')
+    args = parser.parse_args()
+
+    try:
+        manifest = generate(Path(args.out), args.seed, args.sizes, args.formats, args.payloads, args.tasks,
+                            Path(args.schema_dir))
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"Corpus {manifest['corpus_id']} written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Shared Definition $ref Check for schema-validator.py
+
+The published schemas are self-contained, so nothing in the repository uses
+JSON-Schemas/shared/definitions.json. This check keeps the opt-in path working.
+It copies the schema directory to a temporary location, adds probe schemas that
+$ref every definition in shared/definitions.json, and loads them with
+SchemaValidator. Each definition is reached three ways:
+
+    id       from a schema whose $id is on the same host as the shared file
+             (resolved through the registry by $id)
+    file     from a schema without $id (resolved by file path)
+    foreign  from a schema whose $id is on another host (served from the schema
+             directory by retrieve_local, never the network)
+
+For every probe it checks that:
+    - the schema compiles;
+    - its hash depends on the shared file;
+    - a valid sample for each definition passes and an invalid one fails;
+    - a $ref with a constraining sibling keyword still applies both.
+It also checks that shared files are not validation targets. Editing the shared
+file must change the probes' hashes and leave the other schemas' hashes alone.
+
+Usage:
+    python shared_refs_check.py [--schema-dir DIR]
+
+Exits with status 1 when any check fails.
+"""
+
+import argparse
+import json
+import logging
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from generate_corpus import DEFAULT_SCHEMA_DIR, load_script
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+SHARED_FILE = 'shared/definitions.json'
+SHARED_ID = 'https://prompting-gold-standard.com/schemas/shared/definitions.json'
+PROBE_IDS = {
+    'id': 'https://prompting-gold-standard.com/schemas/ref-probe-id.json',
+    'file': None,
+    'foreign': 'https://example.org/schemas/ref-probe-foreign.json',
+}
+# (valid, invalid) instance per shared definition; a new definition needs an entry here
+SAMPLES: Dict[str, Tuple[Any, Any]] = {
+    'timestamp': ('2026-01-01T00:00:00Z', 20260101),
+    'unit_interval': (0.5, 1.5),
+    'percentage': (50, 101),
+    'string_list': (['a', 'b'], ['a', 1]),
+}
+
+
+def probe_schema(schema_id: Any, definitions: List[str]) -> Dict[str, Any]:
+    schema: Dict[str, Any] = {
+        '$schema': 'https://json-schema.org/draft/2020-12/schema',
+        'title': 'Shared $ref probe',
+        'type': 'object',
+        'properties': {name: {'$ref': f'{SHARED_FILE}#/$defs/{name}', 'description': name}
+                       for name in definitions},
+    }
+    # A sibling that constrains the instance keeps the $ref for validation-time lookup
+    schema['properties']['capped_ratio'] = {'$ref': f'{SHARED_FILE}#/$defs/unit_interval', 'maximum': 0.5}
+    if schema_id:
+        schema['$id'] = schema_id
+    return schema
+
+
+def build_schema_dir(source: Path, target: Path, definitions: List[str]) -> None:
+    shutil.copytree(source, target)
+    for kind, schema_id in PROBE_IDS.items():
+        with open(target / f'ref-probe-{kind}.json', 'w', encoding='utf-8') as f:
+            json.dump(probe_schema(schema_id, definitions), f, indent=2)
+
+
+def check_probes(validator, definitions: List[str]) -> List[str]:
+    failures = []
+    for name in ('shared/definitions', SHARED_FILE):
+        if name in validator.schemas:
+            failures.append(f"{name} is offered as a validation target")
+    for kind in PROBE_IDS:
+        schema_name = f'ref-probe-{kind}'
+        if schema_name in validator.schema_errors:
+            failures.append(f"{schema_name}: {validator.schema_errors[schema_name]}")
+            continue
+        if SHARED_ID not in validator.schema_refs.get(schema_name, set()):
+            failures.append(f"{schema_name}: hash does not depend on {SHARED_FILE}")
+        cases = [(name, {name: sample[0]}, True) for name, sample in SAMPLES.items() if name in definitions]
+        cases += [(name, {name: sample[1]}, False) for name, sample in SAMPLES.items() if name in definitions]
+        cases += [('capped_ratio', {'capped_ratio': 0.4}, True), ('capped_ratio', {'capped_ratio': 0.7}, False),
+                  ('capped_ratio', {'capped_ratio': -1}, False)]
+        for name, data, expected in cases:
+            result = validator.validate_data(data, f"{schema_name}:{name}", schema_name)
+            schema_errors = [e for e in result.errors if e.startswith('Schema validation error')]
+            if (not schema_errors) != expected:
+                failures.append(f"{schema_name}: {name}={json.dumps(data[name])} should "
+                                f"{'pass' if expected else 'fail'}, got {result.errors or 'no errors'}")
+    return failures
+
+
+def check_hash_scope(schema_validator, schema_dir: Path, before) -> List[str]:
+    shared_path = schema_dir / SHARED_FILE
+    shared = json.loads(shared_path.read_text(encoding='utf-8'))
+    shared['description'] += ' (edited)'
+    shared_path.write_text(json.dumps(shared, indent=2), encoding='utf-8')
+    after = schema_validator.SchemaValidator(str(schema_dir), rules_dir=str(schema_dir.parent))
+    failures = []
+    for schema_name, schema_hash in before.schema_hashes.items():
+        changed = after.schema_hashes.get(schema_name) != schema_hash
+        uses_shared = SHARED_ID in before.schema_refs.get(schema_name, set())
+        if changed != uses_shared:
+            failures.append(f"{schema_name}: hash {'changed' if changed else 'unchanged'} after editing "
+                            f"{SHARED_FILE}, but it {'uses' if uses_shared else 'does not use'} it")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check $refs into JSON-Schemas/shared through SchemaValidator')
+    parser.add_argument('--schema-dir', default=str(DEFAULT_SCHEMA_DIR),
+                        help="Directory containing JSON schemas (default: the repository's JSON-Schemas)")
+    args = parser.parse_args()
+
+    schema_validator = load_script('schema_validator', 'schema-validator.py')
+    schema_validator.logger.setLevel(logging.WARNING)
+    source = Path(args.schema_dir)
+    with open(source / SHARED_FILE, encoding='utf-8') as f:
+        definitions = sorted(json.load(f)['$defs'])
+    failures = [f"{SHARED_FILE}: no sample for $defs/{name}; add one to SAMPLES"
+                for name in definitions if name not in SAMPLES]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        schema_dir = Path(tmp) / 'JSON-Schemas'
+        build_schema_dir(source, schema_dir, definitions)
+        # No quality rules: they do not affect $ref resolution
+        validator = schema_validator.SchemaValidator(str(schema_dir), rules_dir=tmp)
+        failures += check_probes(validator, definitions)
+        failures += check_hash_scope(schema_validator, schema_dir, validator)
+
+    for failure in failures:
+        logger.error(failure)
+    if failures:
+        logger.error(f"Shared $ref check failed ({len(failures)} failures)")
+        sys.exit(1)
+    logger.info(f"Shared $ref check passed: {len(definitions)} definitions via {len(PROBE_IDS)} reference styles")
+
+
+if __name__ == '__main__':
+    main()